@@ -1,75 +1,143 @@
 # app/audio_helper.py
+import io
 import numpy as np
 import soundfile as sf
 import os
 import uuid
 import sounddevice as sd
-import queue
 
 # --- TUNING PARAMETERS ---
 RMS_THRESHOLD = 0.05  # Lower for local mic (it's normalized -1.0 to 1.0)
 SILENCE_DURATION = 1.0
 RUDE_SILENCE_DURATION = 0.4
 SAMPLE_RATE = 16000
+INITIAL_BUFFER_SECONDS = 30  # pre-sized recording buffer, doubles if exceeded
+RING_BLOCKSIZE = 1024  # open the InputStream with blocksize=RING_BLOCKSIZE
+RING_SLOTS = 64        # ~4 s of local-mic audio before the reader falls behind
 
 class AudioBuffer:
     def __init__(self):
-        self.buffer = []
+        # One preallocated int16 PCM array filled in place; self.n = samples used.
+        self.buffer = np.empty(SAMPLE_RATE * INITIAL_BUFFER_SECONDS, dtype=np.int16)
+        self.n = 0
+        # Running sum of squares over everything recorded (for overall RMS)
+        self.sum_sq = 0.0
         self.silence_start_time = 0
         self.is_recording = False
-        self.q = queue.Queue() # Thread-safe queue for local mic
+        # Single-producer/single-consumer ring for the local mic: the PortAudio
+        # thread only bumps _w, the reader only bumps _r (plain ints, GIL-atomic),
+        # so the realtime callback never locks or allocates.
+        self.ring = np.empty((RING_SLOTS, RING_BLOCKSIZE), dtype=np.float32)
+        self.ring_len = np.zeros(RING_SLOTS, dtype=np.int32)
+        self._w = 0
+        self._r = 0
+        self.dropped = 0
 
     def callback(self, indata, frames, time, status):
         """Callback for sounddevice (Local Mic)"""
         if status:
             print(f"Audio status: {status}")
-        # Make a copy of the current chunk
-        self.q.put(indata.copy())
+        # Blocks larger than a slot (stream not opened with RING_BLOCKSIZE)
+        # are split across consecutive slots instead of being cut short.
+        for start in range(0, frames, RING_BLOCKSIZE):
+            if self._w - self._r >= RING_SLOTS:
+                # reader is behind, don't overwrite unread audio
+                self.dropped += -(-(frames - start) // RING_BLOCKSIZE)
+                return
+            n = min(frames - start, RING_BLOCKSIZE)
+            slot = self._w % RING_SLOTS
+            self.ring[slot, :n] = indata[start:start + n, 0]
+            self.ring_len[slot] = n
+            self._w += 1
 
     def get_chunk_from_queue(self):
-        """Retrieve chunk from local mic queue if available."""
-        if not self.q.empty():
-            return self.q.get()
-        return None
+        """Retrieve chunk from local mic ring if available."""
+        if self._r == self._w:
+            return None
+        slot = self._r % RING_SLOTS
+        chunk = self.ring[slot, :self.ring_len[slot]].copy()
+        self._r += 1
+        return chunk
+
+    def _reserve(self, count):
+        """Make room for `count` more samples (x2 growth); returns the slice to fill."""
+        end = self.n + count
+        if end > len(self.buffer):
+            grown = np.empty(max(end, 2 * len(self.buffer)), dtype=np.int16)
+            grown[:self.n] = self.buffer[:self.n]
+            self.buffer = grown
+        view = self.buffer[self.n:end]
+        self.n = end
+        return view
+
+    @property
+    def rms(self):
+        """Loudness of everything recorded so far (no pass over the history)."""
+        if self.n == 0:
+            return 0.0
+        return float(np.sqrt(self.sum_sq / self.n))
 
-    def add_chunk(self, raw_data, is_local_mic=False):
+    def add_chunk(self, raw_data, is_local_mic=False, keep=True):
         """
         Takes raw audio data, adds to buffer, returns loudness (RMS).
+        With keep=False only the loudness is measured (e.g. waiting for speech).
         """
         if is_local_mic:
             # Local mic (sounddevice) gives float32 [-1.0, 1.0]
-            audio_data = raw_data.flatten()
-            self.buffer.append(audio_data)
-            # Calculate RMS
-            rms = np.sqrt(np.mean(audio_data**2))
-            return rms
+            audio_data = raw_data.reshape(-1)
+            count = audio_data.size
+            if count == 0:
+                return 0.0
+            chunk_sq = float(np.dot(audio_data, audio_data))
+            if keep:
+                # Convert to int16 PCM once, straight into the buffer.
+                np.multiply(np.clip(audio_data, -1.0, 1.0), 32767,
+                            out=self._reserve(count), casting='unsafe')
         else:
             # Robot mic (WAMP) gives int16 [32767]
             audio_int16 = np.frombuffer(raw_data, dtype=np.int16)
-            # Normalize to float32 for consistency in saving
-            audio_float = audio_int16.astype(np.float32) / 32768.0
-            self.buffer.append(audio_float)
-            
-            # RMS for int16 needs different threshold logic, 
-            # but here we normalized it, so threshold 0.05 works for both.
-            rms = np.sqrt(np.mean(audio_float**2))
-            return rms
+            count = audio_int16.size
+            if count == 0:
+                return 0.0
+            # Sum of squares straight on the int16 samples (int64 accumulator),
+            # scaled once, so no float temporaries just to measure loudness.
+            chunk_sq = int(np.einsum('i,i->', audio_int16, audio_int16, dtype=np.int64)) / (32768.0 * 32768.0)
+            if keep:
+                # Already PCM_16, keep the samples as they are.
+                self._reserve(count)[:] = audio_int16
+
+        if keep:
+            self.sum_sq += chunk_sq
+        # RMS for int16 needs different threshold logic,
+        # but here we normalized it, so threshold 0.05 works for both.
+        return np.sqrt(chunk_sq / count)
 
     def clear(self):
-        self.buffer = []
-        # Clear queue too if needed
-        with self.q.mutex:
-            self.q.queue.clear()
+        self.n = 0
+        self.sum_sq = 0.0
+        # Drop unread local-mic blocks too (reader side only, so no race)
+        self._r = self._w
+
+    def save_to_memory(self):
+        """Returns the current buffer as an in-memory WAV (io.BytesIO) for Whisper."""
+        if self.n == 0:
+            return None
+
+        buf = io.BytesIO()
+        sf.write(buf, self.buffer[:self.n], SAMPLE_RATE, format='WAV', subtype='PCM_16')
+        buf.seek(0)
+        buf.name = "speech.wav"  # upload APIs use the name to detect the format
+        return buf
 
     def save_to_wav(self):
-        """Saves current buffer to a temp WAV file for Whisper."""
-        if not self.buffer:
+        """Saves current buffer to a temp WAV file (debugging; prefer save_to_memory)."""
+        if self.n == 0:
             return None
-        
-        full_audio = np.concatenate(self.buffer)
+
         filename = f"temp_{uuid.uuid4().hex}.wav"
-        
-        sf.write(filename, full_audio, SAMPLE_RATE)
+
+        # slice is a view into the buffer, no concatenate copy
+        sf.write(filename, self.buffer[:self.n], SAMPLE_RATE, format='WAV', subtype='PCM_16')
         return filename
 
     @staticmethod
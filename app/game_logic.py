@@ -1,6 +1,9 @@
 # app/game_logic.py
 
 import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
 
 ROWS = 6
 COLS = 7
@@ -10,11 +13,221 @@ HUMAN = 1     # you (red, for example)
 AI = -1       # robot / computer
 
 
+# -------------------------------------------------------------------------
+# BITBOARD CORE
+#
+# The search works on two Python ints (one mask per player) instead of the
+# list-of-lists board. Layout is Tromp's Fhourstones one:
+#
+#   bit index = col * H1 + row      (row 0 = bottom)
+#
+#   .  .  .  .  .  .  .     <- sentinel row (always empty)
+#   5 12 19 26 33 40 47
+#   4 11 18 25 32 39 46
+#   3 10 17 24 31 38 45
+#   2  9 16 23 30 37 44
+#   1  8 15 22 29 36 43
+#   0  7 14 21 28 35 42
+#
+# The extra sentinel bit on top of every column means shifting a mask by
+# 1 / 6 / 7 / 8 never wraps a line from one column into the next.
+#
+# `heights` holds the bit index of the next free cell in every column
+# (a 7-tuple, or a list inside the search), so a move is just
+# `mask | (1 << heights[col]); heights[col] += 1`.
+# -------------------------------------------------------------------------
+H1 = ROWS + 1
+
+BOTTOM = tuple(c * H1 for c in range(COLS))           # empty-column heights
+TOP = tuple(c * H1 + ROWS for c in range(COLS))       # height of a full column
+
+CENTER_MASK = sum(1 << (COLS // 2 * H1 + r) for r in range(ROWS))
+FULL_MASK = sum(1 << (c * H1 + r) for c in range(COLS) for r in range(ROWS))
+
+
+def cell_bit(r, c):
+    """Bit index of list-board cell (r, c), where row 0 is the top row."""
+    return c * H1 + (ROWS - 1 - r)
+
+
+# All 69 four-in-a-row lines, built once at import, as list-board (row, col)
+# tuples: 24 horizontal, 21 vertical, 12 diagonal down-right, 12 up-right.
+WIN_LINES = (
+    [tuple((r, c + i) for i in range(4)) for r in range(ROWS) for c in range(COLS - 3)]
+    + [tuple((r + i, c) for i in range(4)) for r in range(ROWS - 3) for c in range(COLS)]
+    + [tuple((r + i, c + i) for i in range(4)) for r in range(ROWS - 3) for c in range(COLS - 3)]
+    + [tuple((r - i, c + i) for i in range(4)) for r in range(3, ROWS) for c in range(COLS - 3)]
+)
+
+# The same lines as bitboard masks.
+WIN_MASKS = tuple(sum(1 << cell_bit(r, c) for r, c in line) for line in WIN_LINES)
+
+# Shift distance per direction: vertical, diagonal down-right, horizontal, diagonal up-right.
+DIRECTIONS = (1, H1 - 1, H1, H1 + 1)
+
+# For every direction, the bits where a window in that direction starts
+# (its lowest bit). Scoring evaluates all windows of one direction at once.
+WINDOW_STARTS = tuple(
+    sum(w & -w for w in WIN_MASKS if w == (w & -w) * (1 | 1 << d | 1 << 2 * d | 1 << 3 * d))
+    for d in DIRECTIONS
+)
+
+
+def new_bitboard():
+    """Empty position as (human_mask, ai_mask, heights)."""
+    return 0, 0, BOTTOM
+
+
+def make(mask, heights, col):
+    """
+    Drop a piece for the owner of `mask` into column `col`.
+    Returns (new_mask, new_heights); the inputs are left untouched, so the
+    caller "undoes" a move simply by going back to its old values.
+    """
+    h = heights[col]
+    return mask | (1 << h), heights[:col] + (h + 1,) + heights[col + 1:]
+
+
+def is_playable(heights, col):
+    return heights[col] < TOP[col]
+
+
+def has_four(mask):
+    """
+    True if `mask` contains four in a row.
+
+    For every direction d (vertical 1, diagonal 6, horizontal 7, diagonal 8):
+    `y = m & (m >> d)` marks the starts of pairs, `y & (y >> 2d)` the starts
+    of two overlapping pairs, i.e. four in a row.
+    """
+    for d in (1, H1 - 1, H1, H1 + 1):
+        y = mask & (mask >> d)
+        if y & (y >> (2 * d)):
+            return True
+    return False
+
+
+def winning_cells(own, occupied):
+    """
+    Empty cells where the owner of `own` would complete four in a row.
+    Shift-and-AND over the three directions that can have gaps plus the
+    vertical one (which can only be completed on top).
+    """
+    # vertical
+    r = (own << 1) & (own << 2) & (own << 3)
+
+    for d in (H1 - 1, H1, H1 + 1):
+        p = (own << d) & (own << 2 * d)
+        r |= p & (own << 3 * d)      # X X X _
+        r |= p & (own >> d)          # X X _ X
+        p = (own >> d) & (own >> 2 * d)
+        r |= p & (own << d)          # X _ X X
+        r |= p & (own >> 3 * d)      # _ X X X
+
+    return r & (FULL_MASK ^ occupied)
+
+
+def _window_sums(m, d):
+    """
+    Count the pieces of `m` in every window of direction `d` at once.
+
+    Bit i of each result describes the window starting at bit i; the four
+    cells are summed with a bit-sliced adder (ones / twos / fours planes).
+    Returns (exactly_2, exactly_3, exactly_4, empty) masks.
+    """
+    a = m
+    b = m >> d
+    c = m >> 2 * d
+    e = m >> 3 * d
+
+    s1 = a ^ b
+    c1 = a & b
+    s2 = c ^ e
+    c2 = c & e
+    ones = s1 ^ s2
+    k = s1 & s2
+    twos = k ^ c1 ^ c2
+    fours = (k | c1) & c2
+
+    return twos & ~ones, twos & ones, fours, ~(a | b | c | e)
+
+
+def _window_threes(m, d):
+    """Just the (exactly_3, empty) masks of _window_sums, for the opponent."""
+    a = m
+    b = m >> d
+    c = m >> 2 * d
+    e = m >> 3 * d
+
+    s1 = a ^ b
+    s2 = c ^ e
+    # exactly 3 of 4 set: odd count (s1 ^ s2) with one pair fully set
+    return (s1 ^ s2) & ((a & b) | (c & e)), ~(a | b | c | e)
+
+
+def score_bitboard(own, opp):
+    """
+    Overall heuristic score for the player owning `own`.
+    Positive = good for that player, negative = bad.
+
+    Per window: 4 own = +100, 3 own + 1 empty = +5, 2 own + 2 empty = +2,
+    3 opponent + 1 empty = -4 (block opponent). Every direction is scored
+    for all of its windows in parallel with bit operations.
+    """
+    # center column preference (encourage central play)
+    score = (own & CENTER_MASK).bit_count() * 3
+
+    for d, starts in zip(DIRECTIONS, WINDOW_STARTS):
+        own2, own3, own4, own_none = _window_sums(own, d)
+        opp3, opp_none = _window_threes(opp, d)
+        opp_none &= starts
+        score += (
+            100 * (own4 & starts).bit_count()
+            + 5 * (own3 & opp_none).bit_count()
+            + 2 * (own2 & opp_none).bit_count()
+            - 4 * (opp3 & own_none & starts).bit_count()
+        )
+
+    return score
+
+
+# -------------------------------------------------------------------------
+# LIST BOARD API
+#
+# main.py keeps the board as a 6x7 list-of-lists (row 0 = top) because that
+# is what /state serializes for the browser. These functions are thin
+# adapters over the bitboard core.
+#
+# A flat bytearray board wouldn't buy anything here: nothing hot indexes the
+# list board cell by cell any more (scoring, win checks and search all run on
+# the masks), a conversion costs ~4us and happens at most twice per /move,
+# and /state would have to rebuild the nested lists on every poll.
+# -------------------------------------------------------------------------
+
 def new_board():
     """Create an empty 6x7 board (0 = empty)."""
     return [[0 for _ in range(COLS)] for _ in range(ROWS)]
 
 
+def to_bitboard(board):
+    """Convert a list board into (human_mask, ai_mask, heights)."""
+    human_mask = 0
+    ai_mask = 0
+    heights = list(BOTTOM)
+    for c in range(COLS):
+        for r in range(ROWS - 1, -1, -1):
+            cell = board[r][c]
+            if cell == 0:
+                break
+            bit = 1 << heights[c]
+            if cell == HUMAN:
+                human_mask |= bit
+            else:
+                ai_mask |= bit
+            heights[c] += 1
+    return human_mask, ai_mask, tuple(heights)
+
+
 def drop_piece(board, col, player):
     """
     Drop a piece into column `col` for `player` (1 or -1).
@@ -46,64 +259,37 @@ def check_winner(board):
       'draw'     if board full and no winner,
       None       otherwise.
     """
-    # horizontal
-    for r in range(ROWS):
-        for c in range(COLS - 3):
-            window = [board[r][c + i] for i in range(4)]
-            if window[0] != 0 and all(x == window[0] for x in window):
-                return window[0]
-
-    # vertical
-    for c in range(COLS):
-        for r in range(ROWS - 3):
-            window = [board[r + i][c] for i in range(4)]
-            if window[0] != 0 and all(x == window[0] for x in window):
-                return window[0]
-
-    # diagonal down-right
-    for r in range(ROWS - 3):
-        for c in range(COLS - 3):
-            window = [board[r + i][c + i] for i in range(4)]
-            if window[0] != 0 and all(x == window[0] for x in window):
-                return window[0]
-
-    # diagonal up-right
-    for r in range(3, ROWS):
-        for c in range(COLS - 3):
-            window = [board[r - i][c + i] for i in range(4)]
-            if window[0] != 0 and all(x == window[0] for x in window):
-                return window[0]
-
-    # draw?
-    if all(board[0][c] != 0 for c in range(COLS)):
+    human_mask, ai_mask, _ = to_bitboard(board)
+    if has_four(human_mask):
+        return HUMAN
+    if has_four(ai_mask):
+        return AI
+    if human_mask | ai_mask == FULL_MASK:
         return "draw"
-
     return None
 
 
-def get_valid_columns(board):
-    return [c for c in range(COLS) if board[0][c] == 0]
-
-
-def _evaluate_window(window, player):
+def check_winner_last(board, r, c, player):
     """
-    Heuristic score for a 4-cell window relative to `player`.
+    True if the piece `player` just dropped at (r, c) completes four.
+    Only the 4 lines through that cell can have changed, so walk at most
+    3 cells each way instead of rescanning the whole board.
     """
-    score = 0
-    opp = HUMAN if player == AI else AI
-
-    if window.count(player) == 4:
-        score += 100
-    elif window.count(player) == 3 and window.count(0) == 1:
-        score += 5
-    elif window.count(player) == 2 and window.count(0) == 2:
-        score += 2
+    for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+        count = 1
+        for sign in (1, -1):
+            rr, cc = r + sign * dr, c + sign * dc
+            while 0 <= rr < ROWS and 0 <= cc < COLS and board[rr][cc] == player:
+                count += 1
+                if count >= 4:
+                    return True
+                rr += sign * dr
+                cc += sign * dc
+    return False
 
-    # block opponent
-    if window.count(opp) == 3 and window.count(0) == 1:
-        score -= 4
 
-    return score
+def get_valid_columns(board):
+    return [c for c in range(COLS) if board[0][c] == 0]
 
 
 def score_board(board, player):
@@ -111,93 +297,352 @@ def score_board(board, player):
     Overall heuristic score of the board for `player`.
     Positive = good for player, negative = bad.
     """
-    score = 0
-
-    # center column preference (encourage central play)
-    center_col = COLS // 2
-    center_array = [board[r][center_col] for r in range(ROWS)]
-    score += center_array.count(player) * 3
-
-    # horizontal
-    for r in range(ROWS):
-        row = [board[r][c] for c in range(COLS)]
-        for c in range(COLS - 3):
-            window = row[c:c+4]
-            score += _evaluate_window(window, player)
+    human_mask, ai_mask, _ = to_bitboard(board)
+    if player == HUMAN:
+        return score_bitboard(human_mask, ai_mask)
+    return score_bitboard(ai_mask, human_mask)
+
+
+# -------------------------------------------------------------------------
+# TRANSPOSITION TABLE
+#
+# Different move orders reach the same position all the time in Connect 4,
+# so _minimax remembers what it already found. Positions are keyed by a
+# Zobrist hash: one random 64-bit number per (player, cell), XORed together
+# for every occupied cell and updated incrementally as pieces are dropped.
+#
+# We also keep the key of the mirrored board (column c <-> 6 - c) and store
+# under min(key, mirror_key): the heuristic is left/right symmetric, so a
+# position and its mirror image share one entry.
+# -------------------------------------------------------------------------
+_rng = random.Random(0xC4)  # fixed seed -> same keys every run
+
+# ZOBRIST[player_idx][bit], player_idx 0 = human, 1 = AI
+ZOBRIST = tuple(tuple(_rng.getrandbits(64) for _ in range(COLS * H1)) for _ in range(2))
+ZOBRIST_MIRROR = tuple(
+    tuple(keys[(COLS - 1 - i // H1) * H1 + i % H1] for i in range(COLS * H1))
+    for keys in ZOBRIST
+)
+ZOBRIST_AI_TO_MOVE = _rng.getrandbits(64)
+
+TT_SIZE = 1 << 24            # always-replace slots, bounds memory
+_TT_MASK = TT_SIZE - 1
+_tt = {}                     # slot -> (key, depth, value, flag, best_col)
+
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# columns sorted by distance to the center; best moves are almost always here
+MOVE_ORDER = (3, 2, 4, 1, 5, 0, 6)
+
+
+def zobrist_keys(human_mask, ai_mask):
+    """Return (key, mirror_key) for a position from scratch."""
+    key = 0
+    mirror_key = 0
+    for i in range(COLS * H1):
+        if human_mask >> i & 1:
+            key ^= ZOBRIST[0][i]
+            mirror_key ^= ZOBRIST_MIRROR[0][i]
+        elif ai_mask >> i & 1:
+            key ^= ZOBRIST[1][i]
+            mirror_key ^= ZOBRIST_MIRROR[1][i]
+    return key, mirror_key
+
+
+def clear_transposition_table():
+    _tt.clear()
+
+
+# -------------------------------------------------------------------------
+# SEARCH
+# -------------------------------------------------------------------------
+
+def _ordered_moves(own, occupied, heights, hash_col=None):
+    """
+    Playable columns in the order alpha-beta should try them:
+    1) the best move remembered in the TT for this position ("hash move"),
+    2) then by number of threats (open winning cells) the move creates,
+    3) ties broken by distance to the center (MOVE_ORDER).
+    """
+    moves = [c for c in MOVE_ORDER if heights[c] < TOP[c]]
+    if len(moves) < 2:
+        return moves
 
-    # vertical
-    for c in range(COLS):
-        col = [board[r][c] for r in range(ROWS)]
-        for r in range(ROWS - 3):
-            window = col[r:r+4]
-            score += _evaluate_window(window, player)
-
-    # diagonal down-right
-    for r in range(ROWS - 3):
-        for c in range(COLS - 3):
-            window = [board[r + i][c + i] for i in range(4)]
-            score += _evaluate_window(window, player)
-
-    # diagonal up-right
-    for r in range(ROWS - 3):
-        for c in range(COLS - 3):
-            window = [board[r + 3 - i][c + i] for i in range(4)]
-            score += _evaluate_window(window, player)
+    threats = {}
+    for c in moves:
+        bit = 1 << heights[c]
+        threats[c] = winning_cells(own | bit, occupied | bit).bit_count()
+    moves.sort(key=threats.__getitem__, reverse=True)  # stable -> keeps center-first ties
 
-    return score
+    if hash_col is not None and hash_col != moves[0] and hash_col in threats:
+        moves.remove(hash_col)
+        moves.insert(0, hash_col)
+    return moves
 
 
-def _minimax(board, depth, alpha, beta, maximizing):
+def _minimax(ai_mask, human_mask, heights, depth, alpha, beta, maximizing, zkey, mkey):
     """
-    Minimax with alpha-beta pruning.
+    Minimax with alpha-beta pruning on bitboards.
     AI is the maximizing player.
+
+    `zkey` / `mkey` are the Zobrist keys of the position and its mirror.
+    `heights` is a list that is updated in place while a child is searched
+    and restored right after (make/unmake), so no board is ever copied.
+
+    Only the player who made the last move can have just connected four,
+    so each node tests a single mask (callers never pass a decided root).
     """
-    winner = check_winner(board)
-    if depth == 0 or winner is not None:
-        if winner == AI:
-            return None, 10_000
-        elif winner == HUMAN:
+    if maximizing:
+        if has_four(human_mask):
             return None, -10_000
-        elif winner == "draw":
-            return None, 0
+    elif has_four(ai_mask):
+        return None, 10_000
+    if ai_mask | human_mask == FULL_MASK:
+        return None, 0
+
+    # --- transposition table probe ---
+    if maximizing:
+        zkey ^= ZOBRIST_AI_TO_MOVE
+        mkey ^= ZOBRIST_AI_TO_MOVE
+    mirrored = mkey < zkey
+    key = mkey if mirrored else zkey
+    slot = key & _TT_MASK
+
+    hash_col = None
+    entry = _tt.get(slot)
+    if entry is not None and entry[0] == key:
+        _, tt_depth, tt_value, tt_flag, hash_col = entry
+        if hash_col is not None and mirrored:
+            hash_col = COLS - 1 - hash_col
+        if tt_depth >= depth:
+            if tt_flag == EXACT:
+                return hash_col, tt_value
+            if tt_flag == LOWER:
+                alpha = max(alpha, tt_value)
+            else:
+                beta = min(beta, tt_value)
+            if alpha >= beta:
+                return hash_col, tt_value
+
+    if maximizing:
+        zkey ^= ZOBRIST_AI_TO_MOVE
+        mkey ^= ZOBRIST_AI_TO_MOVE
+
+    if depth == 0:
+        value = score_bitboard(ai_mask, human_mask)
+        _tt[slot] = (key, 0, value, EXACT, None)
+        return None, value
+
+    alpha_orig, beta_orig = alpha, beta
+
+    if depth == 1:
+        # Frontier node, specialized: the children are leaves, so score them
+        # inline instead of recursing (no call frame, no leaf TT traffic, no
+        # threat-count ordering just to sort leaves).
+        valid_cols = [c for c in MOVE_ORDER if heights[c] < TOP[c]]
+        if hash_col in valid_cols:
+            valid_cols.remove(hash_col)
+            valid_cols.insert(0, hash_col)
+        best_col = valid_cols[0]
+        if maximizing:
+            value = -math.inf
+            for col in valid_cols:
+                child = ai_mask | (1 << heights[col])
+                if has_four(child):
+                    new_score = 10_000
+                elif child | human_mask == FULL_MASK:
+                    new_score = 0
+                else:
+                    new_score = score_bitboard(child, human_mask)
+                if new_score > value:
+                    value = new_score
+                    best_col = col
+                    if value >= beta:
+                        break
         else:
-            return None, score_board(board, AI)
+            value = math.inf
+            for col in valid_cols:
+                child = human_mask | (1 << heights[col])
+                if has_four(child):
+                    new_score = -10_000
+                elif child | ai_mask == FULL_MASK:
+                    new_score = 0
+                else:
+                    new_score = score_bitboard(ai_mask, child)
+                if new_score < value:
+                    value = new_score
+                    best_col = col
+                    if value <= alpha:
+                        break
+        flag = UPPER if value <= alpha_orig else LOWER if value >= beta_orig else EXACT
+        _tt[slot] = (key, 1, value, flag, COLS - 1 - best_col if mirrored else best_col)
+        return best_col, value
 
-    valid_cols = get_valid_columns(board)
-    if not valid_cols:
-        return None, 0
+    valid_cols = _ordered_moves(ai_mask if maximizing else human_mask, ai_mask | human_mask, heights, hash_col)
 
     if maximizing:
         value = -math.inf
         best_col = valid_cols[0]
         for col in valid_cols:
-            temp = [row[:] for row in board]
-            drop_piece(temp, col, AI)
-            _, new_score = _minimax(temp, depth - 1, alpha, beta, False)
+            h = heights[col]
+            heights[col] = h + 1
+            _, new_score = _minimax(
+                ai_mask | (1 << h), human_mask, heights, depth - 1, alpha, beta, False,
+                zkey ^ ZOBRIST[1][h], mkey ^ ZOBRIST_MIRROR[1][h],
+            )
+            heights[col] = h
             if new_score > value:
                 value = new_score
                 best_col = col
             alpha = max(alpha, value)
             if alpha >= beta:
                 break
-        return best_col, value
     else:
         value = math.inf
         best_col = valid_cols[0]
         for col in valid_cols:
-            temp = [row[:] for row in board]
-            drop_piece(temp, col, HUMAN)
-            _, new_score = _minimax(temp, depth - 1, alpha, beta, True)
+            h = heights[col]
+            heights[col] = h + 1
+            _, new_score = _minimax(
+                ai_mask, human_mask | (1 << h), heights, depth - 1, alpha, beta, True,
+                zkey ^ ZOBRIST[0][h], mkey ^ ZOBRIST_MIRROR[0][h],
+            )
+            heights[col] = h
             if new_score < value:
                 value = new_score
                 best_col = col
             beta = min(beta, value)
             if alpha >= beta:
                 break
-        return best_col, value
+
+    # --- transposition table store (always replace) ---
+    if value <= alpha_orig:
+        flag = UPPER
+    elif value >= beta_orig:
+        flag = LOWER
+    else:
+        flag = EXACT
+    _tt[slot] = (key, depth, value, flag, COLS - 1 - best_col if mirrored else best_col)
+
+    return best_col, value
+
+
+def _forced_move(ai_mask, human_mask, heights):
+    """
+    Static one-ply checks that make a full search pointless:
+    1) AI can win right now -> play it,
+    2) human threatens to win next move -> block it,
+    3) a move that leaves AI with two playable winning cells while the human
+       has no immediate win -> the human can only block one of them.
+    Returns a column or None.
+    """
+    occupied = ai_mask | human_mask
+    moves = [c for c in MOVE_ORDER if heights[c] < TOP[c]]
+    playable = 0
+    for c in moves:
+        playable |= 1 << heights[c]
+
+    ai_wins = winning_cells(ai_mask, occupied) & playable
+    for c in moves:
+        if ai_wins >> heights[c] & 1:
+            return c
+
+    human_wins = winning_cells(human_mask, occupied) & playable
+    for c in moves:
+        if human_wins >> heights[c] & 1:
+            return c
+
+    for c in moves:
+        bit = 1 << heights[c]
+        above = bit << 1 if heights[c] + 1 < TOP[c] else 0
+        next_playable = (playable ^ bit) | above
+        after_ai = ai_mask | bit
+        after_occupied = occupied | bit
+        if winning_cells(human_mask, after_occupied) & next_playable:
+            continue
+        if (winning_cells(after_ai, after_occupied) & next_playable).bit_count() >= 2:
+            return c
+
+    return None
+
+
+# -------------------------------------------------------------------------
+# PARALLEL ROOT SPLIT (Young Brothers Wait)
+#
+# The root's children are independent subtrees. The first (best-ordered)
+# one is searched here to get a real alpha; the others then run in worker
+# processes with that alpha (the GIL rules out threads). Each worker keeps
+# its own TT across calls. Pool start-up and pickling cost milliseconds, so
+# this only pays off for deep searches; shallow ones stay sequential.
+# -------------------------------------------------------------------------
+PARALLEL_MIN_DEPTH = 7
+_pool = None
+
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=min(COLS - 1, os.cpu_count() or 1))
+    return _pool
+
+
+def _search_child(ai_mask, human_mask, heights, depth, alpha, zkey, mkey):
+    """Worker entry point: value of a root child, human to move."""
+    _, value = _minimax(ai_mask, human_mask, list(heights), depth, alpha, math.inf, False, zkey, mkey)
+    return value
+
+
+def _parallel_root(ai_mask, human_mask, heights, depth, zkey, mkey, hash_col=None):
+    """Same result as _minimax(..., depth, -inf, inf, True, ...) at the root."""
+    moves = _ordered_moves(ai_mask, ai_mask | human_mask, heights, hash_col)
+
+    def child(col):
+        h = heights[col]
+        child_heights = heights[:]
+        child_heights[col] = h + 1
+        return (ai_mask | (1 << h), human_mask, child_heights, depth - 1,
+                zkey ^ ZOBRIST[1][h], mkey ^ ZOBRIST_MIRROR[1][h])
+
+    first = child(moves[0])
+    _, alpha = _minimax(*first[:4], -math.inf, math.inf, False, *first[4:])
+
+    pool = _get_pool()
+    futures = [
+        (col, pool.submit(_search_child, *args[:4], alpha, *args[4:]))
+        for col, args in ((c, child(c)) for c in moves[1:])
+    ]
+    # a sibling that can't beat alpha fails low (value <= alpha), so taking the
+    # first strictly better one in move order matches the sequential choice
+    best_col, best_value = moves[0], alpha
+    for col, future in futures:
+        value = future.result()
+        if value > best_value:
+            best_value = value
+            best_col = col
+    return best_col, best_value
 
 
 def get_ai_move(board, depth: int = 4) -> int:
-    """Return best column for AI with given search depth."""
-    col, _ = _minimax(board, depth, -math.inf, math.inf, True)
+    """
+    Return best column for AI with given search depth.
+
+    Immediate wins, forced blocks and double threats are answered without
+    searching. Otherwise uses iterative deepening: every shallower pass
+    fills the TT with hash moves, so the next, deeper pass tries the
+    principal variation first.
+    """
+    human_mask, ai_mask, heights = to_bitboard(board)
+
+    forced = _forced_move(ai_mask, human_mask, heights)
+    if forced is not None:
+        return forced
+
+    heights = list(heights)
+    zkey, mkey = zobrist_keys(human_mask, ai_mask)
+    col = None
+    for d in range(1, depth + 1):
+        if d >= PARALLEL_MIN_DEPTH:
+            col, _ = _parallel_root(ai_mask, human_mask, heights, d, zkey, mkey, col)
+        else:
+            col, _ = _minimax(ai_mask, human_mask, heights, d, -math.inf, math.inf, True, zkey, mkey)
     return col
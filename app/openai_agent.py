@@ -1,20 +1,26 @@
-# templates/openai_agent.py
+# app/openai_agent.py
 
 import os
+import re
 import logging
-from typing import Dict, Any, Optional
+from collections import deque
+from types import MappingProxyType
+from typing import Dict, Any, Optional, Tuple
 
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import AsyncOpenAI
 
 load_dotenv()
 
-_client: Optional[OpenAI] = None
+# per-request cap so a stuck API call can't hold a taunt (and the robot) forever
+LLM_TIMEOUT_S = 2.0
 
-def _get_client() -> OpenAI:
+_client: Optional[AsyncOpenAI] = None
+
+def _get_client() -> AsyncOpenAI:
     global _client
     if _client is None:
-        _client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        _client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), timeout=LLM_TIMEOUT_S)
     return _client
 
 SYSTEM_BASE = """
@@ -36,82 +42,115 @@ Style:
 - No paragraphs. No lists. No emojis.
 """
 
-PHASE_INSTRUCTIONS = {
+PHASE_INSTRUCTIONS = MappingProxyType({
     "intro": "The game just started. Challenge the human and say they don't stand a chance.",
     "midgame": "Comment on the board state. Mock bad moves. Act unimpressed at good moves.",
     "robot_wins": "You just won. Rub it in. Be smug. Tell them to go back to tutorial mode.",
     "human_wins": "You lost. Be salty. Blame luck/lag/glitchy sensors. Demand a rematch.",
     "draw": "It's a draw. Call it boring and say nobody played well.",
-}
+})
 
-MOOD_INSTRUCTIONS = {
+MOOD_INSTRUCTIONS = MappingProxyType({
     "winning_big": "You are DOMINATING: confident, cocky, celebratory, zero respect.",
     "winning": "You are WINNING: smug, teasing, playful.",
     "close": "It's CLOSE: tense, impatient, slightly irritated.",
     "losing": "You are LOSING: salty, defensive, blame luck/sensors, less confident.",
     "losing_big": "You are GETTING COOKED: stressed, coping, petty, desperate for rematch.",
+})
+
+# Full instruction string for every (phase, mood), built once at import
+_INSTRUCTIONS: Dict[Tuple[str, str], str] = {
+    (phase, mood): (
+        SYSTEM_BASE
+        + "\n\nPHASE: " + phase_text
+        + "\nMOOD: " + mood_text
+        + "\nExtra rule: If losing_big, sound more desperate; if winning_big, sound more disrespectful."
+    )
+    for phase, phase_text in PHASE_INSTRUCTIONS.items()
+    for mood, mood_text in MOOD_INSTRUCTIONS.items()
 }
 
+_MOODS = ("losing_big", "losing", "close", "winning", "winning_big")
+
 def _mood_from_lead(lead: int) -> str:
-    if lead >= 6:
-        return "winning_big"
-    if lead >= 3:
-        return "winning"
-    if lead <= -6:
-        return "losing_big"
-    if lead <= -3:
-        return "losing"
-    return "close"
+    # <= -6 losing_big, <= -3 losing, >= 3 winning, >= 6 winning_big; each test adds 1
+    return _MOODS[(lead > -6) + (lead > -3) + (lead >= 3) + (lead >= 6)]
+
+_STATE_TEXT = (
+    "Game state:\n"
+    "Turn={}; RobotScore={}; HumanScore={}; Lead={}; GameOver={}; Winner={}."
+).format
 
 def _snapshot_to_text(s: Dict[str, Any]) -> str:
-    return (
-        f"Turn={s.get('turn_index')}; "
-        f"RobotScore={s.get('ai_score')}; HumanScore={s.get('human_score')}; "
-        f"Lead={s.get('ai_lead')}; "
-        f"GameOver={s.get('game_over')}; Winner={s.get('winner')}."
-    )
+    # main._snapshot always fills every key
+    return _STATE_TEXT(s["turn_index"], s["ai_score"], s["human_score"], s["ai_lead"], s["game_over"], s["winner"])
+
+_FALLBACK_GAME_OVER = MappingProxyType({
+    -1: "Ez clap, you got cooked.",
+    1: "Laggy sensors, doesn’t count—rematch.",
+})
+_FALLBACK_DRAW = "A draw is mid, nobody played well."
+
+_FALLBACK_BY_MOOD = MappingProxyType({
+    "winning_big": "This is a speedrun, you’re lost.",
+    "winning": "You’re slipping, I’m up.",
+    "losing_big": "Okay nah, that was glitchy—run it back.",
+    "losing": "Lucky move, don’t get cocky.",
+    "close": "Stop stalling, place your piece.",
+})
 
 def _fallback_taunt(snapshot: Dict[str, Any], phase: str) -> str:
-    lead = int(snapshot.get("ai_lead", 0) or 0)
-    winner = snapshot.get("winner")
-    game_over = bool(snapshot.get("game_over", False))
-    mood = _mood_from_lead(lead)
+    if snapshot.get("game_over", False):
+        return _FALLBACK_GAME_OVER.get(snapshot.get("winner"), _FALLBACK_DRAW)
+    return _FALLBACK_BY_MOOD[_mood_from_lead(int(snapshot.get("ai_lead", 0) or 0))]
 
-    if game_over:
-        if winner == -1:
-            return "Ez clap, you got cooked."
-        if winner == 1:
-            return "Laggy sensors, doesn’t count—rematch."
-        return "A draw is mid, nobody played well."
-
-    if mood == "winning_big":
-        return "This is a speedrun, you’re lost."
-    if mood == "winning":
-        return "You’re slipping, I’m up."
-    if mood == "losing_big":
-        return "Okay nah, that was glitchy—run it back."
-    if mood == "losing":
-        return "Lucky move, don’t get cocky."
-    return "Stop stalling, place your piece."
+_SENT_END = re.compile(r"[.!?]")
 
 def _clean_one_sentence(text: str) -> str:
     t = (text or "").strip().replace("\n", " ")
-    if not t:
-        return ""
-    for sep in [".", "!", "?"]:
-        i = t.find(sep)
-        if 0 <= i <= 120:
-            t = t[: i + 1]
-            break
-    if len(t) > 180:
-        t = t[:180].rstrip()
-    return t.strip()
+    # cut after the first terminator, if one shows up in the first 121 chars
+    m = _SENT_END.search(t, 0, 121)
+    if m:
+        t = t[: m.end()]
+    return t[:180].rstrip()
+
+# Taunts only really depend on (phase, mood, game over, winner), so keep a few
+# LLM lines per class and rotate through them instead of calling the API on
+# every move. Until a class has TAUNT_VARIANTS lines, each call asks for a new one.
+TAUNT_VARIANTS = 4
+_taunt_cache: Dict[Tuple, deque] = {}  # only touched from the event loop
+
+def _taunt_key(snapshot: Dict[str, Any], phase: str) -> Tuple:
+    lead = int(snapshot.get("ai_lead", 0) or 0)
+    return (phase, _mood_from_lead(lead), bool(snapshot.get("game_over", False)), snapshot.get("winner"))
+
+def _cached_taunt(key: Tuple) -> Optional[str]:
+    variants = _taunt_cache.get(key)
+    if variants is None or len(variants) < TAUNT_VARIANTS:
+        return None
+    variants.rotate(-1)
+    return variants[0]
+
+def _remember_taunt(key: Tuple, text: str) -> None:
+    _taunt_cache.setdefault(key, deque(maxlen=TAUNT_VARIANTS)).append(text)
+
+_MODEL_MISSING = re.compile(r"not found|404|does not exist")
 
 def _is_model_not_found_error(e: Exception) -> bool:
     msg = str(e).lower()
-    return ("model" in msg and ("not found" in msg or "404" in msg or "does not exist" in msg))
-
-def generate_taunt(snapshot: Dict[str, Any], phase: str = "midgame") -> str:
+    return "model" in msg and _MODEL_MISSING.search(msg) is not None
+
+async def warmup() -> None:
+    """Open the API connection at startup so the first taunt doesn't pay TCP/TLS setup."""
+    if not os.getenv("OPENAI_API_KEY"):
+        return
+    try:
+        await _get_client().models.list()
+    except Exception as e:
+        # surfaces bad keys / network trouble at boot; taunts still fall back later
+        logging.warning("OpenAI warmup failed: %s", e)
+
+async def generate_taunt(snapshot: Dict[str, Any], phase: str = "midgame") -> str:
     if phase not in PHASE_INSTRUCTIONS:
         phase = "midgame"
 
@@ -120,20 +159,20 @@ def generate_taunt(snapshot: Dict[str, Any], phase: str = "midgame") -> str:
         logging.warning("No OPENAI_API_KEY found. Using fallback.")
         return _fallback_taunt(snapshot, phase)
 
+    key = _taunt_key(snapshot, phase)
+    cached = _cached_taunt(key)
+    if cached is not None:
+        return cached
+
     primary_model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
     fallback_models = ["gpt-4o-mini", "gpt-4o"]
 
     lead = int(snapshot.get("ai_lead", 0) or 0)
     mood = _mood_from_lead(lead)
 
-    instructions = (
-        SYSTEM_BASE
-        + "\n\nPHASE: " + PHASE_INSTRUCTIONS[phase]
-        + "\nMOOD: " + MOOD_INSTRUCTIONS[mood]
-        + "\nExtra rule: If losing_big, sound more desperate; if winning_big, sound more disrespectful."
-    )
+    instructions = _INSTRUCTIONS[(phase, mood)]
 
-    user_input = "Game state:\n" + _snapshot_to_text(snapshot)
+    user_input = _snapshot_to_text(snapshot)
 
     client = _get_client()
 
@@ -143,7 +182,7 @@ def generate_taunt(snapshot: Dict[str, Any], phase: str = "midgame") -> str:
     for model in models_to_try:
         tried.append(model)
         try:
-            resp = client.responses.create(
+            resp = await client.responses.create(
                 model=model,
                 instructions=instructions,
                 input=user_input,
@@ -151,6 +190,7 @@ def generate_taunt(snapshot: Dict[str, Any], phase: str = "midgame") -> str:
             )
             text = _clean_one_sentence(resp.output_text)
             if text:
+                _remember_taunt(key, text)
                 return text
             return _fallback_taunt(snapshot, phase)
 
@@ -0,0 +1,148 @@
+// app/static/connect4.js - board UI for the index page (see main.py)
+// ROWS/COLS come from window.CFG, set inline by the page.
+
+const ROWS = window.CFG.rows;
+const COLS = window.CFG.cols;
+
+let localBoard = Array(ROWS).fill().map(() => Array(COLS).fill(0));
+let boardSeq = 0;  // sent with each move so a double-click isn't played twice
+
+function init() {
+    const boardEl = document.getElementById("board");
+    const interactEl = document.getElementById("interaction-layer");
+
+    for (let r = 0; r < ROWS; r++) {
+        for (let c = 0; c < COLS; c++) {
+            const cell = document.createElement("div");
+            cell.className = "cell";
+            cell.id = `cell-${r}-${c}`;
+
+            const piece = document.createElement("div");
+            piece.className = "piece";
+            piece.id = `piece-${r}-${c}`;
+            cell.appendChild(piece);
+
+            boardEl.appendChild(cell);
+        }
+    }
+
+    for (let c = 0; c < COLS; c++) {
+        const trigger = document.createElement("div");
+        trigger.className = "col-trigger";
+        trigger.id = `col-${c}`;
+        trigger.onclick = () => playMove(c);
+        interactEl.appendChild(trigger);
+    }
+}
+
+function updateDisplay(state) {
+    boardSeq = state.board_seq;
+    const robotText = document.getElementById("robot-text");
+    const statusBadge = document.getElementById("status-badge");
+
+    // --- UPDATE SCORES ---
+    document.getElementById("score-human").textContent = state.human_score;
+    document.getElementById("score-ai").textContent = state.ai_score;
+    document.getElementById("score-lead").textContent = state.ai_lead;
+
+    // Update Text
+    if (state.last_taunt) {
+        robotText.textContent = `"${state.last_taunt}"`;
+    }
+
+    // Update Status Badge
+    if (state.game_over) {
+        if (state.winner === 1) statusBadge.textContent = "YOU WIN!";
+        else if (state.winner === -1) statusBadge.textContent = "ROBOT WINS";
+        else statusBadge.textContent = "DRAW";
+        statusBadge.classList.remove("active");
+        disableInput(true);
+    } else {
+        if (state.current_player === 1) {
+            statusBadge.textContent = "YOUR TURN";
+            statusBadge.classList.add("active");
+            disableInput(false);
+        } else {
+            statusBadge.textContent = "ROBOT THINKING...";
+            statusBadge.classList.remove("active");
+            disableInput(true);
+        }
+    }
+
+    // Update Board
+    for (let r = 0; r < ROWS; r++) {
+        for (let c = 0; c < COLS; c++) {
+            const newVal = state.board[r][c];
+            const oldVal = localBoard[r][c];
+            const cell = document.getElementById(`cell-${r}-${c}`);
+            const piece = document.getElementById(`piece-${r}-${c}`);
+
+            if (newVal !== 0) {
+                cell.className = newVal === 1 ? "cell p1" : "cell p-1";
+
+                if (oldVal === 0) {
+                    piece.classList.remove("drop-anim");
+                    void piece.offsetWidth; 
+                    piece.classList.add("drop-anim");
+                } else {
+                     piece.style.transform = "translateY(0)";
+                     piece.style.opacity = "1";
+                }
+            } else {
+                cell.className = "cell";
+                piece.style.opacity = "0";
+                piece.classList.remove("drop-anim");
+            }
+        }
+    }
+    localBoard = JSON.parse(JSON.stringify(state.board));
+}
+
+function disableInput(disabled) {
+    for (let c = 0; c < COLS; c++) {
+        const btn = document.getElementById(`col-${c}`);
+        if(disabled) btn.setAttribute("disabled", "true");
+        else btn.removeAttribute("disabled");
+    }
+}
+
+// server pushes a snapshot on connect and on every turn_index bump
+// (new taunt, reset); EventSource reconnects by itself
+function listenForState() {
+    const source = new EventSource("/events");
+    source.onmessage = (e) => updateDisplay(JSON.parse(e.data));
+}
+
+async function playMove(col) {
+    disableInput(true); 
+    try {
+        const res = await fetch("/move", {
+            method: "POST",
+            headers: { "Content-Type": "application/json" },
+            body: JSON.stringify({ column: col, client_seq: boardSeq }),
+        });
+
+        if (!res.ok) {
+            const err = await res.json();
+            alert(err.detail);
+            disableInput(false);
+            return;
+        }
+
+        const data = await res.json();
+        updateDisplay(data);
+    } catch (e) {
+        console.error(e);
+        disableInput(false);
+    }
+}
+
+async function resetGame() {
+    const res = await fetch("/reset", { method: "POST" });
+    const data = await res.json();
+    localBoard = Array(ROWS).fill().map(() => Array(COLS).fill(0));
+    updateDisplay(data);
+}
+
+init();
+listenForState();
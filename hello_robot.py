@@ -1,10 +1,26 @@
 from autobahn.twisted.component import Component, run
 from twisted.internet.defer import inlineCallbacks
 from autobahn.twisted.util import sleep
+from twisted.internet import reactor
 
 # tune these 
 MUSIC_SECONDS = 40      #how long we want the song+dance to last
-DAB_SECONDS_EST = 4.0   #duration of one BlocklyDab animation in seconds
+DAB_SECONDS_EST = 4.0   #duration of one BlocklyDab animation in seconds (don't start one with less than half of this left)
+
+# fixed nod trajectory, built once instead of on every main() call
+HEAD_PITCH_FRAMES = (
+    {"time": 400, "data": {"body.head.pitch": 0.1}},
+    {"time": 1200, "data": {"body.head.pitch": -0.1}},
+    {"time": 2000, "data": {"body.head.pitch": 0.1}},
+    {"time": 2400, "data": {"body.head.pitch": 0.0}},
+)
+
+# everything the robot says in this demo
+LINES = {
+    "intro": "yo bro i really want to eat some cheeseburgers.",
+    "after_dance": "Yo, dat was hard!!!",
+    "outro": "Anyway, let's continue playing",
+}
 
 @inlineCallbacks
 def main(session, details):
@@ -13,10 +29,7 @@ def main(session, details):
     yield sleep(1.0)
 
     yield session.call("rom.actuator.motor.write",
-        frames=[{"time": 400, "data": {"body.head.pitch": 0.1}},
-            {"time": 1200, "data": {"body.head.pitch": -0.1}},
-            {"time": 2000, "data": {"body.head.pitch": 0.1}},
-            {"time": 2400, "data": {"body.head.pitch": 0.0}}],
+        frames=HEAD_PITCH_FRAMES,
         force=True
     ) 
 
@@ -24,7 +37,7 @@ def main(session, details):
 
     yield session.call(
         "rie.dialogue.say",
-        text="yo bro i really want to eat some cheeseburgers."
+        text=LINES["intro"]
     )
 
     # 3. Start the music (non-blocking)
@@ -49,11 +62,13 @@ def main(session, details):
     )
 
     #dab while music plays (should be a non audio behviour)
-    danced = 0.0
-    while danced < MUSIC_SECONDS:
+    # each play() only returns when the animation is done, so the moves can't be
+    # fired all at once; instead time the loop against the clock, not an
+    # estimate per dab, so it ends with the song even when a dab runs long/short
+    music_end = reactor.seconds() + MUSIC_SECONDS
+    while music_end - reactor.seconds() > DAB_SECONDS_EST / 2:
         #to sync the dab stopping with the music, qwe can add any moves we want that should keep looping
         yield session.call("rom.optional.behavior.play", name="BlocklyDuck")
-        danced += DAB_SECONDS_EST   #estimate
 
     # stop music
     yield session.call("rom.actuator.audio.stop")
@@ -61,7 +76,7 @@ def main(session, details):
   
     yield session.call(
         "rie.dialogue.say",
-        text="Yo, dat was hard!!!"
+        text=LINES["after_dance"]
     )
 
 
@@ -74,7 +89,7 @@ def main(session, details):
 
     yield session.call(
         "rie.dialogue.say",
-        text="Anyway, let's continue playing"
+        text=LINES["outro"]
     )
     #yield session.call("rom.optional.behavior.play", name="BlocklyCrouch")
 
@@ -2,10 +2,15 @@
 #
 # High-level idea (architecture):
 # - We run TWO loops in parallel:
-#   1) game_loop(): polls your backend (/state) every ~0.5s to detect new turns, mood, game_over, etc.
+#   1) game_loop(): long-polls your backend (/state/wait) to detect new turns, mood, game_over, etc.
 #      It drives "midgame" reactions (taunts + optional behaviors) and the long "game over" routine.
+#      It runs on the Twisted reactor itself (inlineCallbacks, non-blocking HTTP), not in a thread.
 #   2) listen_loop(): continuously listens to the microphone, transcribes speech, and decides whether
 #      to respond via LLM, do a special "blowout interrupt", or handle rematch YES/NO.
+#      This one is a plain thread: mic capture, STT and the LLM call all block, and they spend
+#      that time in C/socket waits with the GIL released. STT + reply for each phrase run on
+#      a one-thread worker (_handle_utterance) so the mic keeps capturing meanwhile. Robot RPCs go back through
+#      reactor.callFromThread, so every WAMP call still happens on the reactor.
 #
 # Why two loops?
 # - The game state changes due to moves and backend logic; polling is easy and robust.
@@ -29,14 +34,21 @@
 #   and we force rematch_mode = True there. That makes rematch 100% reliable even if the user speaks
 #   during the ending sequence.
 
+import hashlib
+import io
 import os
 import sys
-import json
 import time
 import random
 import requests
+import orjson
 import signal
 import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+import numpy as np
 import speech_recognition as sr
 from dotenv import load_dotenv
 
@@ -45,11 +57,12 @@ from dotenv import load_dotenv
 # - Note: listen_loop runs in a background thread, so it must use reactor.callFromThread
 #   when making WAMP calls.
 from autobahn.twisted.component import Component, run
-from twisted.internet.defer import inlineCallbacks
+from twisted.internet.defer import inlineCallbacks, succeed, DeferredList
 from twisted.internet import threads, reactor
+from twisted.internet.error import ReactorNotRunning
+from twisted.web.client import Agent, HTTPConnectionPool, readBody
 from autobahn.twisted.util import sleep as tSleep
 
-import audioop  # built-in: lets us compute RMS loudness from raw PCM bytes
 
 # OpenAI
 from openai import OpenAI
@@ -70,6 +83,9 @@ BANNED_NAMES = {
     "winning", "losing", "tired", "hungry", "here", "there", "okay", "ok", "yes", "no"
 }
 
+# ONLY explicit: avoids “I’m winning”, “I’m ready”, etc.
+NAME_RE = re.compile(r"\b(?:my name is|call me)\s+([A-Za-z][A-Za-z0-9_-]{1,20})\b", re.I)
+
 def maybe_extract_name(text: str) -> str | None:
     """
     Extremely simple name extraction:
@@ -78,19 +94,17 @@ def maybe_extract_name(text: str) -> str | None:
       so we don't accidentally capture full sentences.
     """
     t = (text or "").strip()
-    # ONLY explicit: avoids “I’m winning”, “I’m ready”, etc.
-    patterns = [
-        r"\bmy name is\s+([A-Za-z][A-Za-z0-9_-]{1,20})\b",
-        r"\bcall me\s+([A-Za-z][A-Za-z0-9_-]{1,20})\b",
-    ]
-    for p in patterns:
-        m = re.search(p, t, flags=re.IGNORECASE)
-        if m:
-            name = m.group(1)
-            if name.lower() in BANNED_NAMES:
-                return None
-            return name
-    return None
+    tl = t.lower()
+    # most utterances name nobody: skip the regex unless a trigger phrase is there
+    if "my name is" not in tl and "call me" not in tl:
+        return None
+    m = NAME_RE.search(t)
+    if not m:
+        return None
+    name = m.group(1)
+    if name.lower() in BANNED_NAMES:
+        return None
+    return name
 
 
 # def maybe_extract_name(text: str) -> str | None:
@@ -113,8 +127,6 @@ def maybe_extract_name(text: str) -> str | None:
 #     return None
 
 
-import tempfile
-
 # -------------------------------------------------------------------------
 # POSTURE TRACKING (BEST-EFFORT)
 #
@@ -148,19 +160,25 @@ PLACEHOLDER_RE = re.compile(
 
 
 # --- REMATCH "YES/NO" INTENT (race-condition fix) ---
-# We *intentionally* do this with regex rather than LLM:
+# We *intentionally* do this with word sets rather than LLM:
 # - It's faster, deterministic, and doesn't fail if the LLM returns something weird.
 # - It also avoids the race where rematch_mode isn't flipped yet but backend game_over is true.
-YES_RE = re.compile(r"\b(yes|yeah|yep|sure|ok|okay|rematch|again|run it back|let'?s go)\b", re.I)
-NO_RE  = re.compile(r"\b(no|nah|nope|quit|stop|leave|exit)\b", re.I)
-
-
-YES_SET = {"yes", "yeah", "yep", "sure", "rematch", "again", "okay", "ok"}
-NO_SET  = {"no", "nah", "nope", "quit", "stop", "exit", "leave"}
-FILLER  = {"please", "bro", "man", "alright"}
+YES_SET = frozenset({"yes", "yeah", "yep", "sure", "rematch", "again", "okay", "ok"})
+NO_SET  = frozenset({"no", "nah", "nope", "quit", "stop", "exit", "leave"})
+FILLER  = frozenset({"please", "bro", "man", "alright"})
+YES_OK = YES_SET | FILLER
+NO_OK = NO_SET | FILLER
+NON_WORD_RE = re.compile(r"[^a-zA-Z' ]+")
 
 def rematch_intent(text: str) -> str | None:
-    s = re.sub(r"[^a-zA-Z' ]+", " ", (text or "").lower()).strip()
+    # Fast path: the usual answer is a single "yes." / "No!" -> plain set lookup
+    tok = (text or "").strip().lower().rstrip(".!?,")
+    if tok in YES_SET:
+        return "yes"
+    if tok in NO_SET:
+        return "no"
+
+    s = NON_WORD_RE.sub(" ", (text or "").lower()).strip()
     if not s:
         return None
 
@@ -177,9 +195,9 @@ def rematch_intent(text: str) -> str | None:
         return None
 
     tokset = set(toks)
-    if tokset & YES_SET and tokset <= (YES_SET | FILLER):
+    if tokset & YES_SET and tokset <= YES_OK:
         return "yes"
-    if tokset & NO_SET and tokset <= (NO_SET | FILLER):
+    if tokset & NO_SET and tokset <= NO_OK:
         return "no"
     return None
 
@@ -198,14 +216,18 @@ def sanitize_midgame_taunt(t: str) -> str:
         return ""
 
     if user_name:
-        t = PLACEHOLDER_RE.sub(user_name, t)
+        # every placeholder has a bracket/brace, every name ask the word "name":
+        # plain substring checks keep the regexes off the usual taunt
+        if "[" in t or "{" in t:
+            t = PLACEHOLDER_RE.sub(user_name, t)
 
         # If it still tries to ask for name, kill it.
-        if NAME_ASK_RE.search(t):
+        if "name" in t.lower() and NAME_ASK_RE.search(t):
             return f"{user_name}, stop stalling and play."
 
     # keep it one sentence-ish
-    t = t.replace("\n", " ").strip()
+    if "\n" in t:
+        t = t.replace("\n", " ").strip()
     return t
 
 
@@ -284,10 +306,40 @@ def reset_per_game_flags():
 
 
 
+# --- ROBOT RPC PROCEDURES ---
+# Every WAMP call goes through one of these; one shared string object per
+# procedure instead of a literal at each call site.
+SAY = "rie.dialogue.say"
+STOP_SPEECH = "rie.dialogue.stop"
+PLAY_BEHAVIOR = "rom.optional.behavior.play"
+STREAM_AUDIO = "rom.actuator.audio.stream"
+
 # --- CONFIG ---
 USE_LOCAL_MIC = True  # Set False for physical robot
 ROBOT_REALM = os.getenv("RIDK_REALM", "rie.693b0e88a7cba444073b9c99")
 WAMP_URL = os.getenv("RIDK_WAMP_URL", "ws://wamp.robotsindeklas.nl")
+
+
+def _wamp_serializers():
+    """
+    Autobahn's msgpack serializer uses whatever `import msgpack` gives it.
+    Without the C extension (odd wheel, PyPy, AUTOBAHN_USE_UMSGPACK) every
+    frame is decoded in pure Python, which eats reactor time on each motor/
+    speech RPC. In that case prefer JSON (stdlib json is C) and keep msgpack
+    as a second choice.
+    """
+    try:
+        import msgpack
+        fast = msgpack.Unpacker.__module__ != "msgpack.fallback"
+    except ImportError:
+        fast = False
+    if fast and "AUTOBAHN_USE_UMSGPACK" not in os.environ:
+        return ["msgpack"]
+    print("[Brain] msgpack C extension not available; using JSON for WAMP (pip install --force-reinstall msgpack)")
+    return ["json", "msgpack"]
+
+
+WAMP_SERIALIZERS = _wamp_serializers()
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 API_URL = "http://127.0.0.1:8000"
@@ -302,6 +354,7 @@ API_URL = "http://127.0.0.1:8000"
 # How to switch:
 # - Default is Google: STT_PROVIDER=google
 # - Use OpenAI:       STT_PROVIDER=openai
+# - Local/offline:    STT_PROVIDER=local  (faster-whisper, INT8 on CPU; pip install faster-whisper)
 #
 # Optional override flag (nice for quick testing):
 # - If USE_OPENAI_STT=1, we force openai regardless of STT_PROVIDER.
@@ -309,12 +362,35 @@ API_URL = "http://127.0.0.1:8000"
 # Notes:
 # - OpenAI STT requires OPENAI_API_KEY to be set.
 # - If OpenAI STT fails (network / key / model), we can fall back to Google if enabled.
+# - Local STT has no network round trip or rate limit; the phrase is already
+#   endpointed by recognizer.listen(), so Whisper only sees the speech itself.
 # -------------------------------------------------------------------------
-STT_PROVIDER = os.getenv("STT_PROVIDER", "google").strip().lower()  # "google" or "openai"
+STT_PROVIDER = os.getenv("STT_PROVIDER", "google").strip().lower()  # "google", "openai" or "local"
 USE_OPENAI_STT = os.getenv("USE_OPENAI_STT", "0").strip() in ("1", "true", "yes", "y")
 STT_MODEL = os.getenv("STT_MODEL", "gpt-4o-mini-transcribe")  # only used if provider=openai
+STT_LOCAL_MODEL = os.getenv("STT_LOCAL_MODEL", "base.en")      # only used if provider=local
+STT_LOCAL_COMPUTE = os.getenv("STT_LOCAL_COMPUTE", "int8")     # int8 weights keep CPU decoding real-time
+STT_LOCAL_DEVICE = os.getenv("STT_LOCAL_DEVICE", "cpu")        # "cuda" on a GPU box (with STT_LOCAL_COMPUTE=float16)
+# >0: decode the VAD segments of a phrase as one batch (BatchedInferencePipeline).
+# Pays off for longer phrases / on GPU; short 1-segment phrases gain nothing.
+STT_LOCAL_BATCH = int(os.getenv("STT_LOCAL_BATCH", "0"))
+
+# Endpointing: STT_VAD=1..3 ends a phrase with WebRTC VAD (webrtcvad, optional
+# dependency; the number is its aggressiveness) once STT_VAD_SILENCE_MS of
+# unvoiced audio follows speech, instead of recognizer.listen()'s energy-based
+# pause_threshold. 0 (default) keeps recognizer.listen().
+STT_VAD = int(os.getenv("STT_VAD", "0"))
+STT_VAD_SILENCE_MS = int(os.getenv("STT_VAD_SILENCE_MS", "300"))
+
+# Mic calibration: the energy threshold from the last clean run is saved here and
+# reused at startup instead of a 1s adjust_for_ambient_noise (dynamic_energy_threshold
+# keeps adapting it while listening anyway). MIC_RECALIBRATE=1 forces a fresh one.
+MIC_CALIBRATION_FILE = os.getenv(
+    "MIC_CALIBRATION_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".mic_energy_threshold")
+)
+MIC_RECALIBRATE = os.getenv("MIC_RECALIBRATE", "0").strip() in ("1", "true", "yes", "y")
 
-# Whether we fall back to Google if OpenAI STT errors out (recommended for demos).
+# Whether we fall back to Google if OpenAI/local STT errors out (recommended for demos).
 STT_FALLBACK_TO_GOOGLE = os.getenv("STT_FALLBACK_TO_GOOGLE", "1").strip() in ("1", "true", "yes", "y")
 
 # Optional: language hint for Google recognizer (can slightly improve accuracy).
@@ -341,6 +417,10 @@ STT_GOOGLE_LANGUAGE = os.getenv("STT_GOOGLE_LANGUAGE", "").strip() or None
 STT_MIN_AUDIO_SEC = float(os.getenv("STT_MIN_AUDIO_SEC", "0.20"))  # 0.20–0.35 is a good range
 STT_MIN_RMS = int(os.getenv("STT_MIN_RMS", "180"))                 # 150–350 depending on mic/room
 STT_DEBUG_AUDIO = os.getenv("STT_DEBUG_AUDIO", "0").strip() in ("1", "true", "yes", "y")
+# BRAIN_DEBUG=1 prints the per-event chatter too (SFX picks, behaviors, idle ticks).
+# Off by default: those fire several times a turn on the reactor thread, and the
+# f-strings are only built when the flag is on. Errors are always printed.
+BRAIN_DEBUG = os.getenv("BRAIN_DEBUG", "0").strip() in ("1", "true", "yes", "y")
 
 # Optional: force OpenAI to assume a language (reduces "random foreign word" guesses).
 # For demos where you want English: set STT_OPENAI_LANGUAGE=en
@@ -350,12 +430,37 @@ STT_OPENAI_LANGUAGE = os.getenv("STT_OPENAI_LANGUAGE", "").strip() or None
 # Optional: ignore 1-word midgame transcripts (prevents bot replying to "I.", "uh", random noise tokens)
 # IMPORTANT: Rematch YES/NO still works because we bypass this filter when game_over=True.
 IGNORE_ONE_WORD_MIDGAME = os.getenv("IGNORE_ONE_WORD_MIDGAME", "1").strip() in ("1", "true", "yes", "y")
-ONE_WORD_ALLOWLIST = {
+ONE_WORD_ALLOWLIST = frozenset({
     "hi", "hello", "hey",
     "yes", "no", "yeah", "yep", "nope",
     "ok", "okay",
     "rematch", "again",
-}
+})
+
+# Optional: also ignore 2-3 word midgame transcripts with nothing in them the
+# robot could answer (no "you"/"robot"/game words/trash talk/the user's name):
+# stray room chatter and STT guesses then never cost an LLM round trip.
+IGNORE_OFFTOPIC_MIDGAME = os.getenv("IGNORE_OFFTOPIC_MIDGAME", "1").strip() in ("1", "true", "yes", "y")
+OFFTOPIC_MAX_WORDS = 3
+RELEVANT_VOCAB = ONE_WORD_ALLOWLIST | frozenset({
+    # talking to / about the robot
+    "you", "your", "you're", "youre", "u", "ur", "robot", "robo", "bot", "i", "i'm", "im", "me", "my", "we",
+    # the game
+    "game", "turn", "move", "play", "playing", "piece", "chip", "column", "board", "connect", "four",
+    "win", "won", "winning", "lose", "lost", "losing", "score", "lead", "draw", "luck", "lucky",
+    # trash talk
+    "bad", "good", "nice", "easy", "ez", "trash", "cooked", "mid", "skill", "cheat", "cheating",
+    "dumb", "stupid", "smart", "bro", "haha", "lol", "wow", "what", "why", "how",
+})
+
+# Hesitation noise that is never worth an LLM call (or a /state fetch), in any
+# game phase. "yeah"/"ok" are deliberately NOT here: they are rematch answers.
+NOISE_WORDS = frozenset({"uh", "uhh", "um", "umm", "hmm", "hm", "mm", "mhm", "er", "erm", "ah", "eh", "oh"})
+WORD_RE = re.compile(r"[A-Za-z']+")
+
+def is_noise_transcript(text: str) -> bool:
+    words = WORD_RE.findall((text or "").lower())
+    return not words or all(w in NOISE_WORDS for w in words)
 
 
 
@@ -386,6 +491,14 @@ WAIT_SFX_DELAY_MAX = 40.0
 
 SFX_COOLDOWN = 10.0  # never play SFX more frequently than this
 
+# game_loop long-polls /state/wait: a new turn wakes it immediately, otherwise
+# it wakes when the next wait-SFX/idle timer is due (clamped to this range).
+STATE_WAIT_MIN = 0.5
+STATE_WAIT_MAX = 10.0
+# A wait that answers faster than this didn't block (new turn, or a since= the
+# server disagrees with): pad it to this gap so a mismatch can't spin the loop.
+STATE_WAIT_FLOOR = 0.1
+
 
 # --- BEHAVIOR ANTI-SPAM ---
 # Robot motions are high-impact; we enforce stronger cooldowns than speech.
@@ -393,56 +506,127 @@ BEHAVIOR_COOLDOWN = 25.0          # seconds between any two behaviors (big impac
 TAG_BEHAVIOR_MAX_CHANCE = 0.12    # even if LLM tags, only do it sometimes
 TAG_BEHAVIOR_DELAY = 0.6          # wait a bit so speech isn't cut off
 
-last_behavior_time = 0.0
+last_behavior_time = float("-inf")
 last_behavior_name = None
 
 
-client = OpenAI(api_key=OPENAI_API_KEY)
+def _openai_http_client():
+    """
+    httpx drops idle connections after 5s, so nearly every reply/STT call used
+    to open a fresh TLS connection. Keep them for 5 minutes instead.
+    None (SDK default client) if the SDK isn't on plain httpx.
+    """
+    try:
+        import httpx
+        from openai import DefaultHttpxClient
+    except ImportError:
+        return None
+    if not issubclass(DefaultHttpxClient, httpx.Client):
+        return None
+    return DefaultHttpxClient(
+        limits=httpx.Limits(max_connections=4, max_keepalive_connections=4, keepalive_expiry=300)
+    )
+
+client = OpenAI(api_key=OPENAI_API_KEY, http_client=_openai_http_client())
+
+def precache_canned_tts():
+    """Render CANNED_LINES (cached on disk by voice + text) and register their URLs. Pool thread."""
+    if not CANNED_TTS_VOICE or not OPENAI_API_KEY:
+        return
+    os.makedirs(CANNED_TTS_DIR, exist_ok=True)
+    for line in CANNED_LINES:
+        key = f"{CANNED_TTS_MODEL}|{CANNED_TTS_VOICE}|{line}".encode()
+        name = hashlib.sha1(key).hexdigest()[:16] + ".mp3"
+        path = os.path.join(CANNED_TTS_DIR, name)
+        try:
+            if not os.path.exists(path):
+                speech = client.audio.speech.create(
+                    model=CANNED_TTS_MODEL, voice=CANNED_TTS_VOICE, input=line, response_format="mp3"
+                )
+                with open(path, "wb") as f:
+                    f.write(speech.content)
+            _canned_tts[line] = SFX_BASE + "tts/" + name
+        except Exception as e:
+            print(f"[Brain] Canned TTS failed for {line!r}: {e}")
+
+def warmup_openai():
+    """Open the API connection at startup so the first reply doesn't pay TCP/TLS setup."""
+    if not OPENAI_API_KEY:
+        return
+    try:
+        client.models.list()
+    except Exception as e:
+        # surfaces bad keys / network trouble at boot; STT/LLM calls still fall back later
+        print(f"[Brain] OpenAI warmup failed: {e}")
+
 recognizer = sr.Recognizer()
 
 # --- SOUND EFFECTS ---
 # Each category is a pool of URLs. We randomly pick one when playing that category.
+# The robot downloads the MP3 itself on every play, so point it straight at
+# raw.githubusercontent.com: github.com/.../raw/... answers with a redirect
+# there first, which cost the robot an extra TLS connection + round trip per SFX.
+# If the robot is on the same LAN as this laptop, the backend serves the same
+# files at /audio/: SFX_BASE_URL=http://<laptop-ip>:8000/audio/ keeps SFX off the internet.
+SFX_BASE = os.getenv("SFX_BASE_URL", "https://raw.githubusercontent.com/Ary-x86/HAI-Robot1/refs/heads/main/audio/")
 SOUNDS = {
     "LOSE": [
-        "https://github.com/Ary-x86/HAI-Robot1/raw/refs/heads/main/audio/tmp_7901-951678082.mp3",
-        "https://github.com/Ary-x86/HAI-Robot1/raw/refs/heads/main/audio/vine-boom.mp3",
-        "https://github.com/Ary-x86/HAI-Robot1/raw/refs/heads/main/audio/mi-bombo.mp3",
-        "https://github.com/Ary-x86/HAI-Robot1/raw/refs/heads/main/audio/fahhh_KcgAXfs.mp3",
-        "https://github.com/Ary-x86/HAI-Robot1/raw/refs/heads/main/audio/let-me-know.mp3",
-        "https://github.com/Ary-x86/HAI-Robot1/raw/refs/heads/main/audio/meme-de-creditos-finales.mp3",
-        "https://github.com/Ary-x86/HAI-Robot1/raw/refs/heads/main/audio/rat-dance-music.mp3",
-        "https://github.com/Ary-x86/HAI-Robot1/raw/refs/heads/main/audio/another-one_dPvHt2Z.mp3",
-        "https://github.com/Ary-x86/HAI-Robot1/raw/refs/heads/main/audio/bye-bye-lumi-athena-sfx.mp3",     
+        SFX_BASE + "tmp_7901-951678082.mp3",
+        SFX_BASE + "vine-boom.mp3",
+        SFX_BASE + "mi-bombo.mp3",
+        SFX_BASE + "fahhh_KcgAXfs.mp3",
+        SFX_BASE + "let-me-know.mp3",
+        SFX_BASE + "meme-de-creditos-finales.mp3",
+        SFX_BASE + "rat-dance-music.mp3",
+        SFX_BASE + "another-one_dPvHt2Z.mp3",
+        SFX_BASE + "bye-bye-lumi-athena-sfx.mp3",
     ],
     "WIN": [
-        "https://github.com/Ary-x86/HAI-Robot1/raw/refs/heads/main/audio/downer_noise.mp3",
-        "https://github.com/Ary-x86/HAI-Robot1/raw/refs/heads/main/audio/spongebob-fail.mp3",
-        "https://github.com/Ary-x86/HAI-Robot1/raw/refs/heads/main/audio/sponge-stank-noise.mp3",
-        "https://github.com/Ary-x86/HAI-Robot1/raw/refs/heads/main/audio/wrong-answer-sound-effect.mp3",
-        "https://github.com/Ary-x86/HAI-Robot1/raw/refs/heads/main/audio/baby-laughing-meme.mp3",     
-        "https://github.com/Ary-x86/HAI-Robot1/raw/refs/heads/main/audio/ny-video-online-audio-converter.mp3",
-        "https://github.com/Ary-x86/HAI-Robot1/raw/refs/heads/main/audio/sitcom-laughing-1.mp3",
+        SFX_BASE + "downer_noise.mp3",
+        SFX_BASE + "spongebob-fail.mp3",
+        SFX_BASE + "sponge-stank-noise.mp3",
+        SFX_BASE + "wrong-answer-sound-effect.mp3",
+        SFX_BASE + "baby-laughing-meme.mp3",
+        SFX_BASE + "ny-video-online-audio-converter.mp3",
+        SFX_BASE + "sitcom-laughing-1.mp3",
     ],
     "ANNOY": [
-        "https://github.com/Ary-x86/HAI-Robot1/raw/refs/heads/main/audio/awkward-moment.mp3",
-        "https://github.com/Ary-x86/HAI-Robot1/raw/refs/heads/main/audio/tuco-get-out.mp3",
-        "https://github.com/Ary-x86/HAI-Robot1/raw/refs/heads/main/audio/oh-my-god-bro-oh-hell-nah-man.mp3",
-        "https://github.com/Ary-x86/HAI-Robot1/raw/refs/heads/main/audio/%EF%BC%82Adrian%EF%BC%82%20Sound%20Effect%20%5BAQXqiVtF2DI%5D.mp3",
-        "https://github.com/Ary-x86/HAI-Robot1/raw/refs/heads/main/audio/aplausos_2.mp3",
-        "https://github.com/Ary-x86/HAI-Robot1/raw/refs/heads/main/audio/enrique.mp3",
-        "https://github.com/Ary-x86/HAI-Robot1/raw/refs/heads/main/audio/error_CDOxCYm.mp3",
-        "https://github.com/Ary-x86/HAI-Robot1/raw/refs/heads/main/audio/he-he-he-ha-clash-royale-deep-fried.mp3",
-        "https://github.com/Ary-x86/HAI-Robot1/raw/refs/heads/main/audio/metal-pipe-clang.mp3",
-        "https://github.com/Ary-x86/HAI-Robot1/raw/refs/heads/main/audio/rizz-sound-effect.mp3",
+        SFX_BASE + "awkward-moment.mp3",
+        SFX_BASE + "tuco-get-out.mp3",
+        SFX_BASE + "oh-my-god-bro-oh-hell-nah-man.mp3",
+        SFX_BASE + "%EF%BC%82Adrian%EF%BC%82%20Sound%20Effect%20%5BAQXqiVtF2DI%5D.mp3",
+        SFX_BASE + "aplausos_2.mp3",
+        SFX_BASE + "enrique.mp3",
+        SFX_BASE + "error_CDOxCYm.mp3",
+        SFX_BASE + "he-he-he-ha-clash-royale-deep-fried.mp3",
+        SFX_BASE + "metal-pipe-clang.mp3",
+        SFX_BASE + "rizz-sound-effect.mp3",
     ],
     "WAIT": [
-        "https://github.com/Ary-x86/HAI-Robot1/raw/refs/heads/main/audio/%EF%BC%82Adrian%EF%BC%82%20Sound%20Effect%20%5BAQXqiVtF2DI%5D.mp3",
-        "https://github.com/Ary-x86/HAI-Robot1/raw/refs/heads/main/audio/we-are-charlie-kirk-song.mp3",
-        "https://github.com/Ary-x86/HAI-Robot1/raw/refs/heads/main/audio/500-cigarettes-tiktok-version.mp3",
-        "https://github.com/Ary-x86/HAI-Robot1/raw/refs/heads/main/audio/pluh.mp3",
+        SFX_BASE + "%EF%BC%82Adrian%EF%BC%82%20Sound%20Effect%20%5BAQXqiVtF2DI%5D.mp3",
+        SFX_BASE + "we-are-charlie-kirk-song.mp3",
+        SFX_BASE + "500-cigarettes-tiktok-version.mp3",
+        SFX_BASE + "pluh.mp3",
     ],
 }
 
+# Optional: pre-render the fixed one-liners (blowout interrupts, rematch answers)
+# with OpenAI TTS at startup and play them as clips, so they skip the robot's
+# text-to-speech step. Off by default: it's a different voice than the robot's own.
+# The clips are written to audio/tts/, so this needs the brain and the backend
+# on one machine and SFX_BASE_URL pointing at the backend's /audio/.
+CANNED_TTS_VOICE = os.getenv("CANNED_TTS_VOICE", "").strip()  # e.g. "onyx"; empty = off
+CANNED_TTS_MODEL = os.getenv("CANNED_TTS_MODEL", "gpt-4o-mini-tts")
+CANNED_TTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "audio", "tts")
+CANNED_LINES = (
+    *LOSING_BIG_INTERRUPTS,
+    *WINNING_BIG_INTERRUPTS,
+    "Here we go again!",
+    "Fine, bye.",
+    "Say yes for a rematch, or no to quit.",
+)
+_canned_tts = {}  # line -> clip URL, filled in by precache_canned_tts()
+
 # --- BEHAVIORS ---
 # These are robot motion "macros" defined in the robot platform.
 # We choose different moves based on mood (winning/losing/annoyed/idle).
@@ -454,17 +638,51 @@ MOVES = {
     "IDLE": ["BlocklyTaiChiChuan", "BlocklyStand"],
 }
 
+# Behavior tags the LLM may put in a reply -> the moves each one can trigger.
+# One compiled pattern both finds the tag and strips all of them from speech.
+TAG_MOVES = {
+    "DANCE": MOVES["WIN_BIG"],
+    "DAB": ["BlocklyDab"],
+    "SNEEZE": ["BlocklySneeze"],
+    "CLAP": ["BlocklyApplause"],
+    "SAD": MOVES["LOSE"],
+}
+TAG_RE = re.compile(r"\[(" + "|".join(TAG_MOVES) + r")\]")
+
+# Shuffle bags for sounds/moves: every option plays once (random order) before
+# any repeats, and a new round never opens with the one that just played.
+# random.choice could pick the same clip twice in a row, which sounds glitchy.
+_bags = {}
+_bag_last = {}
+
+def draw(key, options, avoid=None):
+    """Next item from key's bag; `avoid` (e.g. a clip another bag just played) is put back once."""
+    bag = _bags.get(key)
+    if not bag:
+        bag = _bags[key] = deque(random.sample(options, len(options)))
+        if len(bag) > 1 and bag[0] == _bag_last.get(key):
+            bag.rotate(-1)
+    item = bag.popleft()
+    if avoid is not None and item == avoid and bag:
+        bag.append(item)
+        item = bag.popleft()
+    _bag_last[key] = item
+    return item
+
 # --- GLOBAL STATE ---
 # Shared state across loops.
 # NOTE: These are accessed from different threads without locks.
 # For this use-case it’s usually fine because:
 # - We mainly do "best effort" gating (cooldowns, flags)
 # - Occasional off-by-one timing doesn't break safety
+# - Each timestamp is a single float rebind (atomic under the GIL)
+# All *_time / *_due values are time.monotonic() seconds, so NTP steps or
+# manual clock changes can't fire or suppress cooldowns; never mix with time.time().
 current_game_state = {"ai_lead": 0, "game_over": False}
 last_turn_index = -1
 is_speaking = False            # used to avoid overlapping audio + SFX
 rematch_mode = False           # set when game ends; used to switch speech logic
-last_interaction_time = time.time()
+last_interaction_time = time.monotonic()
 
 # --- SHUTDOWN + WAIT TIMER + COOLDOWN ---
 shutdown_event = threading.Event()
@@ -472,7 +690,7 @@ shutdown_event = threading.Event()
 wait_sfx_due = None
 wait_sfx_turn = None
 wait_sfx_category = "WAIT"
-last_sfx_time = 0.0
+last_sfx_time = float("-inf")
 
 # --- DYNAMIC PROFILE (UPDATED EACH TICK) ---
 # This dict is continuously overwritten by compute_dynamic_profile().
@@ -495,19 +713,14 @@ def _clamp(x: float, lo: float, hi: float) -> float:
 def _clamp01(x: float) -> float:
     return _clamp(x, 0.0, 1.0)
 
+MOODS = ("losing_big", "losing", "close", "winning", "winning_big")
+
 def _mood_from_lead(lead: int) -> str:
     # You can tweak these thresholds safely.
-    if lead >= 6:
-        return "winning_big"
-    if lead >= 3:
-        return "winning"
-    if lead <= -6:
-        return "losing_big"
-    if lead <= -3:
-        return "losing"
-    return "close"
+    # <= -6 losing_big, <= -3 losing, >= 3 winning, >= 6 winning_big; each test adds 1
+    return MOODS[(lead > -6) + (lead > -3) + (lead >= 3) + (lead >= 6)]
 
-def compute_dynamic_profile(lead: int) -> dict:
+def _build_dynamic_profile(lead: int) -> dict:
     """
     Convert game lead into noticeable-but-not-insane probability shifts.
 
@@ -544,6 +757,43 @@ def compute_dynamic_profile(lead: int) -> dict:
         "wait_sfx_chance": wait_chance,
     }
 
+# Every field above saturates at |lead| = 6 (adv is clamped, mood is *_big), so
+# there are only 13 distinct profiles: build them once and hand out the shared
+# (read-only) dicts. Their "lead" is therefore capped at ±PROFILE_LEAD_CAP.
+PROFILE_LEAD_CAP = 6
+_PROFILE_TABLE = {
+    lead: _build_dynamic_profile(lead) for lead in range(-PROFILE_LEAD_CAP, PROFILE_LEAD_CAP + 1)
+}
+
+def compute_dynamic_profile(lead: int) -> dict:
+    return _PROFILE_TABLE[max(-PROFILE_LEAD_CAP, min(PROFILE_LEAD_CAP, lead))]
+
+# mood -> (usual category, its chance, the other category)
+# IMPORTANT CHANGE:
+# - When losing, we now actually use LOSE sounds (instead of mostly WAIT/ANNOY).
+# - This makes the emotional palette shift much more obvious during the game,
+#   not only at the final game-over moment.
+WAIT_SFX_PALETTE = {
+    # Mostly WIN but sometimes ANNOY so it's not a casino
+    "winning_big": ("WIN", 0.8, "ANNOY"),
+    "winning": ("WIN", 0.8, "ANNOY"),
+    "close": ("ANNOY", 0.85, "WAIT"),
+    # losing / losing_big -> actually use LOSE most of the time
+    "losing": ("LOSE", 0.7, "WAIT"),
+    "losing_big": ("LOSE", 0.7, "WAIT"),
+}
+
+# Idle should reflect the state too.
+# IMPORTANT CHANGE:
+# - Losing idle now uses LOSE instead of WAIT so it sounds "deflated" rather than "random meme".
+IDLE_SFX_BY_MOOD = {
+    "winning_big": "ANNOY",  # “hurry up” energy
+    "winning": "ANNOY",
+    "close": "ANNOY",
+    "losing": "LOSE",        # losing => deflated/losing palette
+    "losing_big": "LOSE",
+}
+
 def choose_wait_sfx_category(mood: str) -> str:
     """
     This is where the robot *feels* different (sound palette depends on mood):
@@ -553,27 +803,11 @@ def choose_wait_sfx_category(mood: str) -> str:
 
     This is a simple trick that makes the bot "feel alive" without extra LLM calls.
     """
-    # IMPORTANT CHANGE:
-    # - When losing, we now actually use LOSE sounds (instead of mostly WAIT/ANNOY).
-    # - This makes the emotional palette shift much more obvious during the game,
-    #   not only at the final game-over moment.
-    if mood in ("winning_big", "winning"):
-        # Mostly WIN but sometimes ANNOY so it's not a casino
-        return "WIN" if random.random() < 0.8 else "ANNOY"
-    if mood == "close":
-        return "ANNOY" if random.random() < 0.85 else "WAIT"
-    # losing / losing_big -> actually use LOSE most of the time
-    return "LOSE" if random.random() < 0.7 else "WAIT"
+    usual, chance, other = WAIT_SFX_PALETTE.get(mood, WAIT_SFX_PALETTE["losing"])
+    return usual if random.random() < chance else other
 
 def choose_idle_sfx_category(mood: str) -> str:
-    # Idle should reflect the state too.
-    # IMPORTANT CHANGE:
-    # - Losing idle now uses LOSE instead of WAIT so it sounds "deflated" rather than "random meme".
-    if mood in ("winning_big", "winning"):
-        return "ANNOY"  # “hurry up” energy
-    if mood == "close":
-        return "ANNOY"
-    return "LOSE"       # losing => deflated/losing palette
+    return IDLE_SFX_BY_MOOD.get(mood, "LOSE")
 
 def dynamic_prompt_suffix(lead: int) -> str:
     """
@@ -582,30 +816,62 @@ def dynamic_prompt_suffix(lead: int) -> str:
 
     We DON'T rewrite the whole system prompt each time; we just append a mood hint.
     """
-    mood = _mood_from_lead(lead)
-    if mood == "winning_big":
-        return " You are DOMINATING: be smug, cocky, and playful. Flex hard."
-    if mood == "winning":
-        return " You are winning: be confident and teasing."
-    if mood == "losing_big":
-        return " You are getting cooked: be salty, defensive, and a bit stressed."
-    if mood == "losing":
-        return " You are losing: be annoyed, blame luck/sensors, sound less confident."
-    return " It's close: be tense, impatient, and competitive."
+    return PROMPT_SUFFIX_BY_MOOD[_mood_from_lead(lead)]
+
+PROMPT_SUFFIX_BY_MOOD = {
+    "winning_big": " You are DOMINATING: be smug, cocky, and playful. Flex hard.",
+    "winning": " You are winning: be confident and teasing.",
+    "losing_big": " You are getting cooked: be salty, defensive, and a bit stressed.",
+    "losing": " You are losing: be annoyed, blame luck/sensors, sound less confident.",
+    "close": " It's close: be tense, impatient, and competitive.",
+}
+
+GAMEPLAY_SYSTEM_BASE = (
+    "You are 'Robo', a cocky, competitive Connect 4 robot. "
+    "Keep responses SHORT (1 sentence). "
+    "Use Gen Z slang lightly. "
+    "Never mention being an AI or OpenAI. "
+    "You can perform actions by ending your sentence with tags: "
+    "[DANCE], [DAB], [SNEEZE], [CLAP], [SAD]. "
+    "Tags are RARE: use a tag in at most 1 out of 10 replies, otherwise no tag. "
+    "Only use tags if the situation is extreme. "
+    "Don't use emojis in the responses. "
+)
+
+@lru_cache(maxsize=32)
+def gameplay_system_msg(mood: str, name: str | None) -> str:
+    """Full gameplay prompt; only 5 moods x (rarely changing) name, so each is built once."""
+    system_msg = GAMEPLAY_SYSTEM_BASE + PROMPT_SUFFIX_BY_MOOD[mood]
+
+    # Name behavior:
+    # - If we know it: never ask again, always use it.
+    # - If we don't: ask once early, then stop asking (handled by the prompt).
+    if name:
+        system_msg += f" The user's name is {name}. Never ask for their name. Always address them by name."
+    else:
+        system_msg += " If you don't know the user's name yet, ask once early in the game (not repeatedly)."
+    return system_msg
 
 # -------------------------
 # Shutdown wiring
 # -------------------------
 
+def _stop_reactor():
+    try:
+        reactor.stop()
+    except ReactorNotRunning:
+        pass  # already stopping (e.g. autobahn's run() got there first)
+
 def request_shutdown(reason: str = ""):
     # Unified shutdown so both threads + reactor stop cleanly.
+    # Idempotent: a second Ctrl-C (or a loop noticing the flag) is a no-op.
+    # The loops poll shutdown_event.is_set(), which only reads a flag (no lock).
+    if shutdown_event.is_set():
+        return
     if reason:
         print(f"[Brain] Shutdown requested: {reason}")
     shutdown_event.set()
-    try:
-        reactor.callFromThread(reactor.stop)
-    except Exception:
-        pass
+    reactor.callFromThread(_stop_reactor)
 
 def _sig_handler(signum, frame):
     request_shutdown(f"signal {signum}")
@@ -617,16 +883,93 @@ signal.signal(signal.SIGTERM, _sig_handler)
 # API
 # -------------------------
 
+# One keep-alive HTTP session per thread for the blocking requests calls:
+# the utterance worker (fresh_game_state, trigger_reset), the state-prefetch
+# executor and the reactor pool threads running trigger_reset. Each reuses a
+# hot socket instead of opening a new TCP connection per call. game_loop's
+# long-poll doesn't use these: it's Twisted's Agent, on the reactor itself.
+_http = threading.local()
+
+# (ETag, body) of the last /state answer: unchanged polls come back as an
+# empty 304. Kept as one tuple so both threads always see a matching pair.
+_last_state = (None, {})
+_last_state_at = float("-inf")  # monotonic time of the last successful fetch
+
+# An answer this recent is as good as a new request (see fresh_game_state).
+STATE_REUSE_S = 0.3
+
+
+def _http_session() -> requests.Session:
+    session = getattr(_http, "session", None)
+    if session is None:
+        session = _http.session = requests.Session()
+        # one backend host, and each thread only has one request in flight:
+        # a single pooled keep-alive connection, not the default 10x10 pool
+        session.mount("http://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=1))
+    return session
+
+
 def fetch_game_state():
     """
     Poll the backend for game state.
     Expected keys (based on your usage):
     - turn_index, game_over, last_taunt, ai_lead, winner, etc.
+
+    The returned dict is shared with the ETag cache: treat it as read-only.
     """
+    global _last_state, _last_state_at
     try:
-        res = requests.get(f"{API_URL}/state", timeout=0.5)
+        etag, cached = _last_state
+        headers = {"If-None-Match": etag} if etag else None
+        res = _http_session().get(f"{API_URL}/state", headers=headers, timeout=0.5)
+        if res.status_code == 304:
+            _last_state_at = time.monotonic()
+            return cached
         if res.status_code == 200:
-            return res.json()
+            # orjson straight from the body bytes (res.json() would decode to str first)
+            state = orjson.loads(res.content)
+            _last_state = (res.headers.get("ETag"), state)
+            _last_state_at = time.monotonic()
+            return state
+    except Exception:
+        pass
+    return {}
+
+def fresh_game_state():
+    """fetch_game_state(), unless some thread got an answer in the last STATE_REUSE_S."""
+    if time.monotonic() - _last_state_at < STATE_REUSE_S:
+        return _last_state[1]
+    return fetch_game_state()
+
+# listen_loop asks for /state while STT is still running, so the round trip
+# hides under the transcription instead of following it.
+_state_prefetch = ThreadPoolExecutor(max_workers=1, thread_name_prefix="state-prefetch")
+
+# game_loop's long-poll runs on the reactor itself (Twisted's own HTTP client,
+# keep-alive pool) instead of parking a threadpool thread for up to 10s per wait.
+_agent = None
+
+def _get_agent() -> Agent:
+    global _agent
+    if _agent is None:
+        _agent = Agent(reactor, pool=HTTPConnectionPool(reactor, persistent=True))
+    return _agent
+
+@inlineCallbacks
+def wait_game_state(since: int, timeout: float):
+    """
+    Long-poll the backend: fires as soon as turn_index != since, or with the
+    current state after `timeout` seconds (so timers still get their tick).
+    Reactor thread; fires {} if the backend is unreachable.
+    """
+    url = f"{API_URL}/state/wait?since={since}&timeout={timeout:.2f}".encode()
+    try:
+        d = _get_agent().request(b"GET", url)
+        d.addTimeout(timeout + 1.0, reactor)
+        res = yield d
+        body = yield readBody(res)
+        if res.code == 200:
+            return orjson.loads(body)
     except Exception:
         pass
     return {}
@@ -638,11 +981,55 @@ def trigger_reset():
     and the rematch handler will keep prompting.
     """
     try:
-        requests.post(f"{API_URL}/reset", timeout=1)
+        _http_session().post(f"{API_URL}/reset", timeout=1)
     except Exception:
         pass
 
-def generate_response(user_text, context_type="gameplay"):
+# Streamed replies are spoken clause by clause: cut after , . ! ? once a clause
+# has at least STREAM_MIN_CLAUSE chars (so TTS doesn't get one-word fragments).
+# A run-on with no punctuation is cut at its last space past STREAM_MAX_CLAUSE,
+# so it still starts playing before the whole reply is in.
+CLAUSE_END_RE = re.compile(r"[.!?,]\s")
+STREAM_MIN_CLAUSE = 12
+STREAM_MAX_CLAUSE = 40
+
+def _emit_clause(on_clause, clause: str):
+    if "[" in clause:
+        clause = TAG_RE.sub("", clause)
+    clause = clause.strip()
+    if clause:
+        on_clause(clause)
+
+def _stream_reply(model: str, system_msg: str, context: str, on_clause) -> str:
+    """Stream the reply; each finished clause (tags stripped) goes to on_clause. Returns the full text."""
+    stream = client.responses.create(
+        model=model,
+        instructions=system_msg,
+        input=context,
+        max_output_tokens=60,
+        stream=True,
+    )
+    parts = []
+    pending = ""
+    for event in stream:
+        if event.type != "response.output_text.delta":
+            continue
+        parts.append(event.delta)
+        pending += event.delta
+        m = CLAUSE_END_RE.search(pending, STREAM_MIN_CLAUSE)
+        while m:
+            _emit_clause(on_clause, pending[:m.end()])
+            pending = pending[m.end():]
+            m = CLAUSE_END_RE.search(pending, STREAM_MIN_CLAUSE)
+        if len(pending) > STREAM_MAX_CLAUSE:
+            cut = pending.rfind(" ", STREAM_MIN_CLAUSE)
+            if cut > 0:
+                _emit_clause(on_clause, pending[:cut])
+                pending = pending[cut + 1:]
+    _emit_clause(on_clause, pending)
+    return "".join(parts)
+
+def generate_response(user_text, context_type="gameplay", on_clause=None, state=None):
     """
     LLM response generator.
 
@@ -652,56 +1039,42 @@ def generate_response(user_text, context_type="gameplay"):
 
     Even though we now handle game_over rematch directly (race fix),
     we keep this mode for safety/fallback and because rematch_mode can still be used.
+
+    With on_clause set, the reply is streamed and on_clause(text) is called per
+    clause as it arrives, so speech can start before the reply is complete.
+    Pass the caller's fresh /state as `state` to skip fetching it again.
     """
     try:
         if context_type == "rematch":
             system_msg = "If YES: 'ACTION_RESET'. If NO: 'ACTION_QUIT'. Else ask again."
             context = f"User said: {user_text}"
         else:
-            state = fetch_game_state()
+            if state is None:
+                state = fetch_game_state()
             lead = int(state.get("ai_lead", 0) or 0)
 
-            system_msg = (
-                "You are 'Robo', a cocky, competitive Connect 4 robot. "
-                "Keep responses SHORT (1 sentence). "
-                "Use Gen Z slang lightly. "
-                "Never mention being an AI or OpenAI. "
-                "You can perform actions by ending your sentence with tags: "
-                "[DANCE], [DAB], [SNEEZE], [CLAP], [SAD]. "
-                "Tags are RARE: use a tag in at most 1 out of 10 replies, otherwise no tag. "
-                "Only use tags if the situation is extreme. "
-                "Don't use emojis in the responses. "
-            ) + dynamic_prompt_suffix(lead)
-
+            system_msg = gameplay_system_msg(_mood_from_lead(lead), user_name)
             context = f"Score Lead: {lead}. User said: {user_text}"
 
-            # Name behavior:
-            # - If we know it: never ask again, always use it.
-            # - If we don't: ask once early, then stop asking (handled by the prompt).
-            if user_name:
-                system_msg += f" The user's name is {user_name}. Never ask for their name. Always address them by name."
-            else:
-                system_msg += " If you don't know the user's name yet, ask once early in the game (not repeatedly)."
-
-        try:
+        def ask(model):
+            if on_clause is not None:
+                return _stream_reply(model, system_msg, context, on_clause)
             response = client.responses.create(
-                model=OPENAI_MODEL,
+                model=model,
                 instructions=system_msg,
                 input=context,
                 max_output_tokens=60,
             )
             return response.output_text or ""
+
+        try:
+            return ask(OPENAI_MODEL)
         except Exception as e:
             # Basic fallback if model name is wrong/unavailable.
+            # (raised by create() itself, so nothing was streamed/spoken yet)
             msg = str(e).lower()
             if "model" in msg and ("not found" in msg or "404" in msg):
-                response = client.responses.create(
-                    model="gpt-4o-mini",
-                    instructions=system_msg,
-                    input=context,
-                    max_output_tokens=60,
-                )
-                return response.output_text or ""
+                return ask("gpt-4o-mini")
             raise
 
     except Exception as e:
@@ -731,7 +1104,7 @@ def schedule_wait_sfx(turn: int, profile: dict):
     wait_sfx_category = choose_wait_sfx_category(profile["mood"])
 
     if random.random() < float(profile.get("wait_sfx_chance", WAIT_SFX_CHANCE)):
-        wait_sfx_due = time.time() + random.uniform(WAIT_SFX_DELAY_MIN, WAIT_SFX_DELAY_MAX)
+        wait_sfx_due = time.monotonic() + random.uniform(WAIT_SFX_DELAY_MIN, WAIT_SFX_DELAY_MAX)
     else:
         wait_sfx_due = None
 
@@ -747,6 +1120,56 @@ def cancel_wait_sfx():
 # Actuation
 # -------------------------
 
+def in_reactor(*steps):
+    """
+    Run several (fn, *args) steps back to back in one reactor turn: one
+    cross-thread wakeup for the lot instead of one callFromThread each.
+    """
+    def run():
+        for fn, *args in steps:
+            fn(*args)
+    reactor.callFromThread(run)
+
+_say_tail = None  # last queued SAY (reactor thread only)
+
+def replace_speech(session, text: str, interrupt: bool = True):
+    """
+    Cut off the current line (if interrupt) and say `text`. Reactor thread.
+    Both CALLs go out in the same reactor turn, so there's no gap between them.
+    The new SAY becomes the queue tail, so after_queued_speech waits for it.
+    """
+    global _say_tail
+    if interrupt:
+        session.call(STOP_SPEECH).addErrback(lambda f: None)
+    d = _say_call(session, text)
+    d.addErrback(lambda f: print(f"[Brain] say failed: {f.getErrorMessage()}"))
+    _say_tail = d
+    return d
+
+def _say_call(session, text: str):
+    """SAY, or the pre-rendered clip if `text` is a canned line. Reactor thread."""
+    url = _canned_tts.get(text)
+    if url is not None:
+        return session.call(STREAM_AUDIO, url=url, sync=True)
+    return session.call(SAY, text=text)
+
+def say_queued(session, text: str):
+    """SAY after any still-running queued SAY (streamed clauses must not overlap). Reactor thread."""
+    global _say_tail
+    d = _say_tail if _say_tail is not None else succeed(None)
+    d.addBoth(lambda _: _say_call(session, text))
+    d.addErrback(lambda f: print(f"[Brain] say failed: {f.getErrorMessage()}"))
+    _say_tail = d
+
+def after_queued_speech(fn):
+    """Run fn() once every SAY queued so far has returned. Reactor thread."""
+    d = _say_tail if _say_tail is not None else succeed(None)
+    d.addBoth(lambda _: fn())
+
+def _speech_finished():
+    global is_speaking
+    is_speaking = False
+
 @inlineCallbacks
 def safe_play_behavior(session, name: str, sync: bool = True, why: str = ""):
     """
@@ -754,8 +1177,9 @@ def safe_play_behavior(session, name: str, sync: bool = True, why: str = ""):
     you'll SEE it immediately in the console.
     """
     try:
-        print(f"[Brain] 🕺 Behavior: {name} (sync={sync}) {('|' + why) if why else ''}")
-        yield session.call("rom.optional.behavior.play", name=name, sync=sync)
+        if BRAIN_DEBUG:
+            print(f"[Brain] 🕺 Behavior: {name} (sync={sync}) {('|' + why) if why else ''}")
+        yield session.call(PLAY_BEHAVIOR, name=name, sync=sync)
         _mark_posture_from_behavior(name)
     except Exception as e:
         print(f"[Brain] ❌ Behavior failed ({name}): {e}")
@@ -763,6 +1187,18 @@ def safe_play_behavior(session, name: str, sync: bool = True, why: str = ""):
 
 
 
+_sfx_lock = threading.Lock()
+
+def _claim_sfx_slot() -> bool:
+    """Cooldown check + last_sfx_time update as one step, so two callers can't both pass."""
+    global last_sfx_time
+    with _sfx_lock:
+        now = time.monotonic()
+        if now - last_sfx_time < SFX_COOLDOWN:
+            return False
+        last_sfx_time = now
+        return True
+
 @inlineCallbacks
 def play_sfx(session, category, force=False):
     """
@@ -772,28 +1208,30 @@ def play_sfx(session, category, force=False):
     - Sound effects add "texture" and make the robot feel reactive.
     - Cooldown prevents it from becoming an annoying soundboard.
     """
-    global last_sfx_time
-
     if shutdown_event.is_set():
         return
     if is_speaking:
         return
 
-    now = time.time()
-    if now - last_sfx_time < SFX_COOLDOWN:
-        return
-
     # Dynamic chance (still respects force)
     effective = float(dynamic_profile.get("sfx_chance", SFX_CHANCE))
     if not force and random.random() > effective:
         return
 
     url_list = SOUNDS.get(category, [])
-    if url_list:
-        url = random.choice(url_list)
-        print(f"[Brain] 🎵 Playing SFX ({category}): {url}")
-        last_sfx_time = now
-        yield session.call("rom.actuator.audio.stream", url=url, sync=False)
+    if url_list and _claim_sfx_slot():
+        # categories share a few clips, so also dodge the last SFX of any category
+        url = draw(("SFX", category), url_list, avoid=_bag_last.get("SFX"))
+        _bag_last["SFX"] = url
+        if BRAIN_DEBUG:
+            print(f"[Brain] 🎵 Playing SFX ({category}): {url}")
+        yield session.call(STREAM_AUDIO, url=url, sync=False)
+
+# Gating rolls stay on the stdlib RNG: random.random()/getrandbits are ~30ns,
+# while handing out values from a pre-drawn numpy buffer measured 90-130ns per
+# value once the Python-level indexing is paid (and events fire a few times per turn).
+ROLL_BITS = 21
+ROLL_ONE = 1 << ROLL_BITS
 
 @inlineCallbacks
 def perform_midgame_event(session, text, anim_name, sfx_category, profile: dict, turn: int):
@@ -823,13 +1261,19 @@ def perform_midgame_event(session, text, anim_name, sfx_category, profile: dict,
 
     global is_speaking
 
+    # One RNG draw split into two independent 21-bit rolls (speech, behavior);
+    # p * ROLL_ONE as an int threshold gives the same odds as random() < p.
+    roll = random.getrandbits(2 * ROLL_BITS)
+    speak_roll = roll & (ROLL_ONE - 1)
+    behave_roll = roll >> ROLL_BITS
+
     # Speech is probabilistic so it doesn't respond on every single move
     # (that would feel robotic and spammy).
-    if text and random.random() < move_speak:
+    if text and speak_roll < int(move_speak * ROLL_ONE):
         print(f"[Brain] 🤖 Speaking: {text}")
         is_speaking = True
         try:
-            yield session.call("rie.dialogue.say", text=text)
+            yield session.call(SAY, text=text)
         finally:
             is_speaking = False
 
@@ -839,7 +1283,7 @@ def perform_midgame_event(session, text, anim_name, sfx_category, profile: dict,
     # Behaviors are also probabilistic and are kept rarer than speech.
     # IMPORTANT CHANGE:
     # - Use safe_play_behavior so failures are visible AND posture tracking updates.
-    if anim_name and random.random() < behave:
+    if anim_name and behave_roll < int(behave * ROLL_ONE):
         yield safe_play_behavior(session, anim_name, sync=True, why="midgame reaction")
 
 @inlineCallbacks
@@ -852,7 +1296,8 @@ def perform_idle_action(session, profile: dict):
     - A subtle idle reaction makes the robot feel present even when nothing happens.
     """
     mood = profile.get("mood", "close")
-    print(f"[Brain] ⏳ Robot is bored... (mood={mood})")
+    if BRAIN_DEBUG:
+        print(f"[Brain] ⏳ Robot is bored... (mood={mood})")
 
     cat = choose_idle_sfx_category(mood)
     yield play_sfx(session, cat, force=True)
@@ -863,7 +1308,7 @@ def perform_idle_action(session, profile: dict):
     idle_move_chance = _clamp01(0.25 + 0.10 * max(0, adv) - 0.10 * max(0, -adv))
 
     if random.random() < idle_move_chance:
-        anim = random.choice(MOVES["IDLE"])
+        anim = draw("IDLE", MOVES["IDLE"])
         yield safe_play_behavior(session, anim, sync=True, why="idle action")
 
 # -------------------------
@@ -889,75 +1334,124 @@ def transcribe_audio_google(audio: sr.AudioData) -> str | None:
         print(f"[Brain] STT(Google) failed: {e}")
         return None
 
+# Uploads go out as 16 kHz mono Ogg/Opus: ~3 kB/s instead of WAV's 32 kB/s,
+# which is most of the STT wait on a slow uplink. Flips off for the rest of the
+# run if soundfile/libsndfile can't encode Opus, and we send WAV instead.
+_opus_upload_ok = True
+
+def _stt_upload(audio: sr.AudioData) -> tuple[str, bytes]:
+    """(filename, bytes) for the STT upload; the extension tells the API the format."""
+    global _opus_upload_ok
+    if _opus_upload_ok:
+        try:
+            import soundfile as sf
+            pcm = np.frombuffer(audio.get_raw_data(convert_rate=16000, convert_width=2), dtype=np.int16)
+            buf = io.BytesIO()
+            sf.write(buf, pcm, 16000, format="OGG", subtype="OPUS")
+            return "speech.ogg", buf.getvalue()
+        except Exception as e:
+            _opus_upload_ok = False
+            print(f"[Brain] Opus upload unavailable, sending WAV: {e}")
+    return "speech.wav", audio.get_wav_data(convert_rate=16000, convert_width=2)
+
 def transcribe_audio_openai(audio: sr.AudioData) -> str | None:
     """
     OpenAI speech-to-text.
 
-    Why we write to a temp WAV:
-    - The OpenAI client expects a file-like object for transcription.
-    - speech_recognition gives us raw bytes; easiest is to dump to a temp .wav.
+    The audio is encoded in memory (see _stt_upload) and handed to the SDK as
+    a (filename, bytes) pair, so there is no temp file to write, reopen and
+    unlink on every utterance.
 
     Notes:
-    - We use delete=False + manual unlink to avoid file-handle quirks on some platforms.
     - If this fails, listen_loop can fall back to Google if STT_FALLBACK_TO_GOOGLE=1.
     """
     try:
-        wav_bytes = audio.get_wav_data(convert_rate=16000, convert_width=2)
+        upload = _stt_upload(audio)
+
+        # NOTE:
+        # - Passing a language hint reduces "random foreign word" guesses for noise.
+        # - Keep STT_OPENAI_LANGUAGE empty if you want auto-detect.
+        kwargs = {}
+        if STT_OPENAI_LANGUAGE:
+            kwargs["language"] = STT_OPENAI_LANGUAGE
+
+        tr = client.audio.transcriptions.create(
+            model=STT_MODEL,
+            file=upload,
+            response_format="text",
+            **kwargs,
+        )
+
+        # The SDK can return either a string or an object with `.text`.
+        if isinstance(tr, str):
+            return tr.strip()
+        if hasattr(tr, "text"):
+            return (tr.text or "").strip()
+        return str(tr).strip()
 
-        tmp_path = None
-        try:
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
-                tmp_path = f.name
-                f.write(wav_bytes)
-                f.flush()
-
-            with open(tmp_path, "rb") as audio_file:
-                # NOTE:
-                # - Passing a language hint reduces "random foreign word" guesses for noise.
-                # - Keep STT_OPENAI_LANGUAGE empty if you want auto-detect.
-                kwargs = {}
-                if STT_OPENAI_LANGUAGE:
-                    kwargs["language"] = STT_OPENAI_LANGUAGE
-
-                tr = client.audio.transcriptions.create(
-                    model=STT_MODEL,
-                    file=audio_file,
-                    response_format="text",
-                    **kwargs,
-                )
+    except Exception as e:
+        print(f"[Brain] STT(OpenAI) failed: {e}")
+        return None
 
 
-            # The SDK can return either a string or an object with `.text`.
-            if isinstance(tr, str):
-                return tr.strip()
-            if hasattr(tr, "text"):
-                return (tr.text or "").strip()
-            return str(tr).strip()
+_whisper_model = None
 
-        finally:
-            if tmp_path:
-                try:
-                    os.unlink(tmp_path)
-                except Exception:
-                    pass
+def _get_whisper_model():
+    """Load the local Whisper model (or its batched pipeline) once; the first call takes a few seconds."""
+    global _whisper_model
+    if _whisper_model is None:
+        from faster_whisper import WhisperModel  # optional dependency, only for STT_PROVIDER=local
+        model = WhisperModel(STT_LOCAL_MODEL, device=STT_LOCAL_DEVICE, compute_type=STT_LOCAL_COMPUTE)
+        if STT_LOCAL_BATCH > 0:
+            from faster_whisper import BatchedInferencePipeline
+            model = BatchedInferencePipeline(model=model)
+        _whisper_model = model
+    return _whisper_model
+
+def transcribe_audio_local(audio: sr.AudioData) -> str | None:
+    """
+    Local speech-to-text with faster-whisper (CTranslate2).
 
+    Why:
+    - no HTTPS round trip per phrase, no rate limits, works offline
+    - INT8 weights make a small model fast enough on a laptop CPU
+    """
+    try:
+        raw = audio.get_raw_data(convert_rate=16000, convert_width=2)  # 16kHz, 16-bit
+        samples = np.frombuffer(raw, dtype=np.int16).astype(np.float32) / 32768.0
+        # greedy decoding: these are 1-sentence phrases, beam search only adds latency
+        kwargs = {"batch_size": STT_LOCAL_BATCH} if STT_LOCAL_BATCH > 0 else {}
+        segments, _ = _get_whisper_model().transcribe(samples, beam_size=1, **kwargs)
+        return " ".join(seg.text.strip() for seg in segments).strip()
     except Exception as e:
-        print(f"[Brain] STT(OpenAI) failed: {e}")
+        print(f"[Brain] STT(local) failed: {e}")
         return None
 
-
-
 def transcribe_audio(audio: sr.AudioData) -> str | None:
     """
     Single entry point for STT so the rest of the code stays clean.
 
     Decision logic:
     - If USE_OPENAI_STT=1 -> force OpenAI
-    - Else use STT_PROVIDER (google/openai)
-    - If OpenAI fails and STT_FALLBACK_TO_GOOGLE=1 -> try Google as backup
+    - Else use STT_PROVIDER (google/openai/local)
+    - If OpenAI/local fails and STT_FALLBACK_TO_GOOGLE=1 -> try Google as backup
+
+    No transcript cache keyed on the audio bytes: two live mic takes of the
+    same "yes" never have identical PCM, so it would never hit. Fast repeat
+    answers come from skipping STT work instead (audio gate, rematch_intent).
     """
     provider = "openai" if USE_OPENAI_STT else STT_PROVIDER
 
+    if provider == "local":
+        text = transcribe_audio_local(audio)
+        if text:
+            return text
+
+        if STT_FALLBACK_TO_GOOGLE:
+            return transcribe_audio_google(audio)
+
+        return None
+
     if provider == "openai":
         # If key is missing, don't hard-crash the demo; try fallback.
         if not OPENAI_API_KEY:
@@ -987,13 +1481,20 @@ def _audio_stats_for_gate(audio: sr.AudioData) -> tuple[float, int]:
 
     - duration_seconds: rejects micro-bursts (clicks, bumps, tiny noise)
     - rms: rejects quiet background hiss that OpenAI would otherwise "turn into a word"
+
+    With the mic already at 16 kHz (see _microphone), get_raw_data returns
+    frame_data itself without converting it; the RMS then costs one float64
+    copy of the samples (astype) plus one dot-product pass over that copy.
     """
     try:
         raw = audio.get_raw_data(convert_rate=16000, convert_width=2)  # 16kHz, 16-bit
         if not raw:
             return 0.0, 0
-        duration = len(raw) / (16000 * 2)  # samples * bytes_per_sample
-        rms = audioop.rms(raw, 2)          # 2 bytes/sample
+        samples = np.frombuffer(raw, dtype=np.int16).astype(np.float64)
+        duration = samples.size / 16000
+        # same value as audioop.rms (exact: the sum of squares stays < 2**53),
+        # ~1.6x faster via BLAS dot, and audioop is gone in Python 3.13
+        rms = int(np.sqrt(samples.dot(samples) / samples.size))
         return duration, rms
     except Exception:
         # If anything goes wrong, fail "open" (let STT try) rather than breaking the pipeline.
@@ -1008,6 +1509,14 @@ def _should_transcribe_audio(audio: sr.AudioData) -> bool:
     - If audio is too short or too quiet, we skip transcription entirely.
     - That prevents OpenAI from hallucinating random 1-word outputs.
     """
+    # Duration straight from the byte count first: micro-bursts (the usual
+    # rejects) then never pay for the 16kHz resample + RMS pass.
+    raw_dur = len(audio.frame_data) / (audio.sample_rate * audio.sample_width)
+    if raw_dur < STT_MIN_AUDIO_SEC:
+        if STT_DEBUG_AUDIO:
+            print(f"[Brain] 🎙️ audio_gate: dur={raw_dur:.3f}s (min_dur={STT_MIN_AUDIO_SEC}) -> too short")
+        return False
+
     dur, rms = _audio_stats_for_gate(audio)
 
     if STT_DEBUG_AUDIO:
@@ -1032,32 +1541,80 @@ def _should_ignore_transcript_midgame(text: str, game_over_now: bool) -> bool:
     - Never ignore during game_over rematch flow (YES/NO might be 1 word).
     - If IGNORE_ONE_WORD_MIDGAME=1:
         ignore single-word transcripts unless in allowlist.
+    - If IGNORE_OFFTOPIC_MIDGAME=1:
+        ignore 2-3 word transcripts that share no word with RELEVANT_VOCAB.
     """
     if game_over_now:
         return False
 
     if not IGNORE_ONE_WORD_MIDGAME:
+        return _is_offtopic(WORD_RE.findall((text or "").lower()))
+
+    # Fast path: an allowlisted word as-is ("Hey!") -> one set probe, no regex
+    if (text or "").strip().lower().rstrip(".!?,") in ONE_WORD_ALLOWLIST:
         return False
 
-    words = [w for w in re.findall(r"[A-Za-z']+", (text or "").lower()) if w]
+    words = WORD_RE.findall((text or "").lower())
     if len(words) <= 1:
-        w = words[0] if words else ""
-        if w and (w in ONE_WORD_ALLOWLIST):
-            return False
-        return True
+        # findall never yields "", so an empty list is the only falsy case
+        return not (words and words[0] in ONE_WORD_ALLOWLIST)
+    return _is_offtopic(words)
+
+
+def _is_offtopic(words: list[str]) -> bool:
+    if not IGNORE_OFFTOPIC_MIDGAME or not 2 <= len(words) <= OFFTOPIC_MAX_WORDS:
+        return False
+    if user_name and user_name.lower() in words:
+        return False
+    return RELEVANT_VOCAB.isdisjoint(words)
+
 
-    return False
+# -------------------------
+# Game-over macros
+# -------------------------
 
+# Scripted endings as data: ("say", text) or ("play", behavior), run strictly
+# in order (the order is the joke). Each step is still its own robot RPC: the
+# robot platform has no macro/batch procedure we could hand the list to.
+ROBOT_WIN_MACRO = (
+    ("play", "BlocklyDab"),
+    ("say", "Just kidding. I don’t shake hands with losers."),
+    ("play", "BlocklyGangnamStyle"),
+    ("play", "BlocklyCrouch"),  # crouch punchline
+)
+ROBOT_LOSE_MACRO = (
+    ("play", "BlocklyShrug"),
+    ("say", "Run it back?"),
+    ("play", "BlocklyStand"),  # end in stand so you don’t stay crouched
+)
+
+@inlineCallbacks
+def run_macro(session, steps, why: str = ""):
+    for op, arg in steps:
+        if shutdown_event.is_set():
+            return
+        if op == "say":
+            yield session.call(SAY, text=arg)
+        else:
+            yield safe_play_behavior(session, arg, sync=True, why=why)
 
 # -------------------------
 # Main loops
 # -------------------------
 
+def _next_timer_in() -> float:
+    """Seconds until game_loop has timed work to do (wait SFX or idle action)."""
+    due = last_interaction_time + IDLE_TIMEOUT
+    if wait_sfx_due is not None:
+        due = min(due, wait_sfx_due)
+    return _clamp(due - time.monotonic(), STATE_WAIT_MIN, STATE_WAIT_MAX)
+
+
 @inlineCallbacks
 def game_loop(session):
     """
     This loop is the "game event detector":
-    - It polls /state
+    - It long-polls /state/wait (wakes on a new turn or the next timer)
     - Detects new turns and game_over transitions
     - Drives:
       - scheduled wait SFX (stalling)
@@ -1073,13 +1630,19 @@ def game_loop(session):
     print("[Brain] 🎮 Game Loop Active")
 
     cancel_wait_sfx()
+    seen_turn = -1  # turn_index of the last state we got back
 
     while not shutdown_event.is_set():
+        state = {}
+        asked_at = time.monotonic()
         try:
-            state = yield threads.deferToThread(fetch_game_state)
+            state = yield wait_game_state(seen_turn, _next_timer_in())
             if state:
                 current_game_state = state
                 turn = int(state.get("turn_index", -1) or -1)
+                # raw value: the `or -1` above maps a fresh backend's turn 0 to -1,
+                # and since=-1 would then make every /state/wait return at once
+                seen_turn = int(state.get("turn_index", -1))
                 game_over = bool(state.get("game_over", False))
                 taunt = state.get("last_taunt", "")
                 lead = int(state.get("ai_lead", 0) or 0)
@@ -1095,7 +1658,7 @@ def game_loop(session):
                     and not rematch_mode
                     and not is_speaking
                     and turn == wait_sfx_turn
-                    and time.time() >= wait_sfx_due
+                    and time.monotonic() >= wait_sfx_due
                 ):
                     yield play_sfx(session, wait_sfx_category, force=True)
                     cancel_wait_sfx()
@@ -1104,15 +1667,15 @@ def game_loop(session):
                 if (
                     not game_over
                     and not is_speaking
-                    and (time.time() - last_interaction_time > IDLE_TIMEOUT)
+                    and (time.monotonic() - last_interaction_time > IDLE_TIMEOUT)
                 ):
                     yield perform_idle_action(session, dynamic_profile)
-                    last_interaction_time = time.time() + IDLE_INTERVAL
+                    last_interaction_time = time.monotonic() + IDLE_INTERVAL
 
                 # --- NEW TURN DETECTED ---
                 if turn > last_turn_index:
                     last_turn_index = turn
-                    last_interaction_time = time.time()
+                    last_interaction_time = time.monotonic()
 
                     cancel_wait_sfx()
                     if not game_over and not rematch_mode:
@@ -1138,33 +1701,35 @@ def game_loop(session):
 
                         # This is your "scripted" ending sequence.
                         # Scripted content is good here because it is reliable and feels intentional.
+                        # The SFX (audio stream) and the first line (TTS) don't depend on each
+                        # other, so both calls go out together; everything after stays in order.
                         if winner == -1:
-                            yield play_sfx(session, "WIN", force=True)
-                            yield session.call("rie.dialogue.say", text="Good game. Come on, let’s shake hands.")
-                            yield safe_play_behavior(session, "BlocklyDab", sync=True, why="game over win (-1)")
-                            yield session.call("rie.dialogue.say", text="Just kidding. I don’t shake hands with losers.")
-                            yield safe_play_behavior(session, "BlocklyGangnamStyle", sync=True, why="game over win (-1)")
-                            yield safe_play_behavior(session, "BlocklyCrouch", sync=True, why="game over win (-1) crouch punchline")
+                            yield DeferredList([
+                                play_sfx(session, "WIN", force=True),
+                                session.call(SAY, text="Good game. Come on, let’s shake hands."),
+                            ], consumeErrors=True)
+                            yield run_macro(session, ROBOT_WIN_MACRO, why="game over win (-1)")
 
                         elif winner == 1:  # USER WON, ROBOT LOST
-                            yield play_sfx(session, "LOSE", force=True)  # your goofy “robot lost” pool
                             nm = user_name or "player"
-                            yield session.call("rie.dialogue.say", text=f"Okay {nm}… you got me. That was kinda clean.")
-                            yield safe_play_behavior(session, "BlocklyShrug", sync=True, why="game over user win (robot lose)")
-                            yield session.call("rie.dialogue.say", text="Run it back?")
-                            # (optional) end in stand so you don’t stay crouched
-                            yield safe_play_behavior(session, "BlocklyStand", sync=True, why="post-game posture reset")
+                            yield DeferredList([
+                                play_sfx(session, "LOSE", force=True),  # your goofy “robot lost” pool
+                                session.call(SAY, text=f"Okay {nm}… you got me. That was kinda clean."),
+                            ], consumeErrors=True)
+                            yield run_macro(session, ROBOT_LOSE_MACRO, why="game over user win (robot lose)")
 
 
                         else:
-                            yield play_sfx(session, "ANNOY", force=True)
-                            yield session.call("rie.dialogue.say", text="Draw game.")
+                            yield DeferredList([
+                                play_sfx(session, "ANNOY", force=True),
+                                session.call(SAY, text="Draw game."),
+                            ], consumeErrors=True)
                         
                         ending_sequence_active = False
 
                         # If user already said a clean YES/NO during the cutscene, act now safely.
                         if pending_rematch_action == "reset":
-                            yield session.call("rie.dialogue.say", text="Say less. Rematch.")
+                            yield session.call(SAY, text="Say less. Rematch.")
                             yield threads.deferToThread(trigger_reset)
                             reset_per_game_flags()
                             rematch_mode = False
@@ -1172,17 +1737,17 @@ def game_loop(session):
                             continue
 
                         if pending_rematch_action == "quit":
-                            yield session.call("rie.dialogue.say", text="Alright. We’re done.")
+                            yield session.call(SAY, text="Alright. We’re done.")
                             pending_rematch_action = None
                             continue
 
                         # Otherwise ask normally:
-                        yield session.call("rie.dialogue.say", text="Do you want a rematch? Say yes or no.")
+                        yield session.call(SAY, text="Do you want a rematch? Say yes or no.")
                         rematch_prompted = True
 
 
                         yield tSleep(1.0)
-                        yield session.call("rie.dialogue.say", text="Do you want a rematch? Say yes.")
+                        yield session.call(SAY, text="Do you want a rematch? Say yes.")
 
                     # 2) MID-GAME MOVE (now mood-aware)
                     elif not rematch_mode and taunt and not is_speaking:
@@ -1191,17 +1756,17 @@ def game_loop(session):
 
                         # winning => dance more; losing => deflated; close => irritated
                         if mood == "winning_big":
-                            anim = random.choice(MOVES["WIN_BIG"])
+                            anim = draw("WIN_BIG", MOVES["WIN_BIG"])
                         elif mood == "winning":
-                            anim = random.choice(MOVES["WIN_SMALL"])
+                            anim = draw("WIN_SMALL", MOVES["WIN_SMALL"])
                         elif mood == "losing_big":
-                            anim = random.choice(MOVES["LOSE"])
+                            anim = draw("LOSE", MOVES["LOSE"])
                         elif mood == "losing":
-                            anim = "BlocklyShrug" if random.random() < 0.6 else random.choice(MOVES["LOSE"])
+                            anim = "BlocklyShrug" if random.random() < 0.6 else draw("LOSE", MOVES["LOSE"])
                         else:
                             # close game => annoyance gestures sometimes
                             if random.random() < 0.35:
-                                anim = random.choice(MOVES["ANNOY"])
+                                anim = draw("ANNOY", MOVES["ANNOY"])
 
                         taunt = sanitize_midgame_taunt(taunt)
 
@@ -1231,7 +1796,15 @@ def game_loop(session):
         except Exception as e:
             print(f"[Brain] game_loop error: {e}")
 
-        yield tSleep(0.5)
+        if not state:
+            # backend down: don't spin on failing requests
+            yield tSleep(0.5)
+        else:
+            # New turns and timer ticks come back through the long-poll, which
+            # normally blocks; only a reply that didn't block gets padded.
+            left = STATE_WAIT_FLOOR - (time.monotonic() - asked_at)
+            if left > 0:
+                yield tSleep(left)
 
 
 def _should_allow_tag_behavior(anim: str) -> bool:
@@ -1249,7 +1822,7 @@ def _should_allow_tag_behavior(anim: str) -> bool:
     """
     global last_behavior_time, last_behavior_name
 
-    now = time.time()
+    now = time.monotonic()
     if now - last_behavior_time < BEHAVIOR_COOLDOWN:
         return False
 
@@ -1291,6 +1864,332 @@ def _should_allow_tag_behavior(anim: str) -> bool:
 
 
 
+def _load_energy_threshold() -> float | None:
+    try:
+        with open(MIC_CALIBRATION_FILE) as f:
+            value = float(f.read().strip())
+    except (OSError, ValueError):
+        return None
+    return value if value > 0 else None
+
+def _save_energy_threshold(value: float):
+    try:
+        with open(MIC_CALIBRATION_FILE, "w") as f:
+            f.write(f"{value:.1f}\n")
+    except OSError as e:
+        print(f"[Brain] Could not save mic calibration: {e}")
+
+VAD_RATE = 16000
+VAD_FRAME = 480    # 30 ms at 16 kHz (webrtcvad takes 10/20/30 ms frames)
+VAD_PREROLL = 10   # unvoiced frames kept before the onset, so the first syllable isn't clipped
+
+_vad = None
+
+def _get_vad():
+    global _vad
+    if _vad is None:
+        import webrtcvad  # optional dependency, only for STT_VAD>0
+        _vad = webrtcvad.Vad(STT_VAD)
+    return _vad
+
+def _listen_vad(source, timeout: float, phrase_time_limit: float) -> sr.AudioData:
+    """
+    recognizer.listen() with VAD endpointing. `source` must be a 16 kHz
+    Microphone (see _microphone). Raises sr.WaitTimeoutError like listen().
+    """
+    vad = _get_vad()
+    frame_s = VAD_FRAME / VAD_RATE
+    end_after = max(1, round(STT_VAD_SILENCE_MS / 1000 / frame_s))
+
+    # wait for the first voiced frame
+    preroll = deque(maxlen=VAD_PREROLL)
+    waited = 0.0
+    while True:
+        buf = source.stream.read(VAD_FRAME)
+        if vad.is_speech(buf, VAD_RATE):
+            break
+        preroll.append(buf)
+        waited += frame_s
+        if waited > timeout:
+            raise sr.WaitTimeoutError("listening timed out while waiting for phrase to start")
+
+    frames = list(preroll)
+    frames.append(buf)
+    max_frames = int(phrase_time_limit / frame_s)
+    silent = 0
+    while silent < end_after and len(frames) < max_frames:
+        buf = source.stream.read(VAD_FRAME)
+        frames.append(buf)
+        silent = 0 if vad.is_speech(buf, VAD_RATE) else silent + 1
+    if silent:
+        del frames[-silent:]  # trailing silence only costs STT time
+    return sr.AudioData(b"".join(frames), VAD_RATE, source.SAMPLE_WIDTH)
+
+@contextmanager
+def _microphone():
+    """
+    The mic at 16 kHz in 30 ms chunks: what the gate, STT uploads and the VAD
+    all want, so no phrase is resampled downstream. Device default rate if the
+    device refuses 16 kHz.
+    """
+    mic = sr.Microphone(sample_rate=VAD_RATE, chunk_size=VAD_FRAME)
+    mic.__enter__()
+    if mic.stream is None:  # sr.Microphone swallows the open error and leaves stream unset
+        print("[Brain] 🎧 Mic won't open at 16 kHz, using its default rate")
+        mic = sr.Microphone()
+        mic.__enter__()
+    try:
+        yield mic
+    finally:
+        mic.__exit__(None, None, None)
+
+# One worker = utterances are handled strictly one at a time, in the order
+# they were heard, so the speech state below never sees two replies at once.
+_utterance_worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="utterance")
+
+def _handle_utterance(session, audio: sr.AudioData):
+    """Transcribe one captured phrase and react to it (steps 2-6 of listen_loop)."""
+    global is_speaking, rematch_mode, last_interaction_time, last_posture
+    global user_name, ending_sequence_active, pending_rematch_action, rematch_prompted
+    global _prev_game_over_seen, used_losing_big_interrupt, used_winning_big_interrupt
+
+    if shutdown_event.is_set():
+        return
+
+    try:
+        # Start the game-state peek now; it's ready by the time STT is.
+        # (If the game ends mid-STT, latest_state below still catches it.)
+        state_future = _state_prefetch.submit(fetch_game_state)
+
+        try:
+            # IMPORTANT CHANGE:
+            # - STT is now switchable (Google vs OpenAI) using STT_PROVIDER / USE_OPENAI_STT.
+            # - This is isolated behind transcribe_audio() so the rest of the logic stays identical.
+            text = transcribe_audio(audio) or ""
+            if is_noise_transcript(text):
+                if text and STT_DEBUG_AUDIO:
+                    print(f"[Brain] 🧹 Ignored filler transcript: {text!r}")
+                return
+
+            last_interaction_time = time.monotonic()
+            print(f"[Brain] 🗣️ You: {text}")
+
+            # Peek game state (fresh backend truth, fetched alongside STT).
+            # This lets speech logic react correctly even if game_loop hasn't ticked yet.
+            state = state_future.result()
+            lead_now = int(state.get("ai_lead", 0) or 0)
+            game_over_now = bool(state.get("game_over", False))
+
+            # --- NAME LOCK (START-OF-GAME ONLY) ---
+            # We only accept a name at the beginning of a game.
+            # This prevents accidental captures like "I'm winning", "I'm tired", etc.
+            turn_now = int(state.get("turn_index", -1) or -1)
+            if (user_name is None) and (turn_now <= 0) and (not game_over_now) and (not rematch_mode):
+                name = maybe_extract_name(text)
+                if name:
+                    user_name = name
+                    print(f"[Brain] ✅ Locked user_name={user_name}")
+            #-------------
+            # POST-STT FILTER (OPTIONAL BUT VERY EFFECTIVE)
+            #
+            # If we are NOT in rematch/game_over flow, ignore 1-word (and off-topic 2-3 word) transcripts.
+            # This stops the robot replying to random single tokens (noise -> "I", "Dios", etc.).
+            # ------------------------------------------------------------------
+            if _should_ignore_transcript_midgame(text, game_over_now=game_over_now):
+                if STT_DEBUG_AUDIO:
+                    print(f"[Brain] 🧹 Ignored short transcript midgame: {text!r}")
+                return
+
+
+            # Reset per-game flags when a new game starts:
+            # Detect transition: game_over True -> False (after /reset)
+            if _prev_game_over_seen is None:
+                _prev_game_over_seen = game_over_now
+            else:
+                if _prev_game_over_seen and not game_over_now:
+                    reset_per_game_flags()
+                _prev_game_over_seen = game_over_now
+
+            # ------------------------------------------------------------------
+            # HARD REMATCH HANDLER (race-condition fix)
+            #
+            # Problem:
+            # - User says "yes" exactly when the game ends.
+            # - Backend already says game_over=True.
+            # - But game_loop hasn't processed it yet -> rematch_mode might still be False.
+            # - Then we send text to gameplay LLM, and reset never triggers.
+            #
+            # Fix:
+            # - If backend says game_over_now=True, we treat rematch as active RIGHT HERE.
+            # - We parse YES/NO deterministically using regex and trigger reset immediately.
+            # - This path avoids the LLM entirely, so it can't "forget" to output ACTION_RESET.
+            # ------------------------------------------------------------------
+            if game_over_now:
+
+                intent = rematch_intent(text)
+
+                # During cutscene: only record, do NOT reset yet
+                if ending_sequence_active:
+                    if intent == "yes":
+                        pending_rematch_action = "reset"
+                    elif intent == "no":
+                        pending_rematch_action = "quit"
+                    return
+
+                # After prompt (or if prompt flag lags): act immediately
+                if intent == "yes":
+                    print("[Brain] 🟢 Rematch!")
+                    is_speaking = True
+                    in_reactor((say_queued, session, "Here we go again!"), (after_queued_speech, _speech_finished))
+                    trigger_reset()
+                    reset_per_game_flags()
+                    rematch_mode = False
+                    rematch_prompted = False
+                    return
+
+                if intent == "no":
+                    print("[Brain] 🔴 Quit.")
+                    is_speaking = True
+                    in_reactor((say_queued, session, "Fine, bye."), (after_queued_speech, _speech_finished))
+                    return
+
+                if rematch_prompted:
+                    # only nag if we actually prompted
+                    is_speaking = True
+                    in_reactor(
+                        (say_queued, session, "Say yes for a rematch, or no to quit."),
+                        (after_queued_speech, _speech_finished),
+                    )
+                return
+
+            # Only do blowout interrupts midgame (not during rematch prompt, not after game_over)
+            if (not rematch_mode) and (not game_over_now):
+                if (lead_now <= -BLOWOUT_LEAD) and (not used_losing_big_interrupt):
+                    used_losing_big_interrupt = True
+                    phrase = random.choice(LOSING_BIG_INTERRUPTS)
+
+                    print(f"[Brain] 🤖 BlowoutInterrupt(LOSING): {phrase}")
+                    in_reactor((replace_speech, session, phrase, is_speaking), (after_queued_speech, _speech_finished))
+                    is_speaking = True
+                    return  # IMPORTANT: ignore user's message, no LLM response
+
+                if (lead_now >= BLOWOUT_LEAD) and (not used_winning_big_interrupt):
+                    used_winning_big_interrupt = True
+                    phrase = random.choice(WINNING_BIG_INTERRUPTS)
+
+                    print(f"[Brain] 🤖 BlowoutInterrupt(WINNING): {phrase}")
+                    in_reactor((replace_speech, session, phrase, is_speaking), (after_queued_speech, _speech_finished))
+                    is_speaking = True
+                    return  # IMPORTANT: ignore user's message, no LLM response
+
+        except Exception:
+            return
+
+        # Learn user name (only once). This is used for personalization.
+        # IMPORTANT CHANGE:
+        # - Previously you only learned the name once (user_name is None).
+        # - If STT misheard the name the first time, you were stuck forever.
+        # - Now: if user says "my name is X" again, we update it.
+        name = maybe_extract_name(text)
+        if name and name != user_name:
+            user_name = name
+            print(f"[Brain] ✅ Updated user_name={user_name}")
+
+        # If robot is speaking, stop current speech so responses feel reactive.
+        if is_speaking:
+            reactor.callFromThread(session.call, STOP_SPEECH)
+
+        is_speaking = True
+
+        # PATCH 3 (extra safety):
+        # - Decide context based on rematch_mode *AND* fresh backend truth.
+        # - This prevents misrouting even if rematch_mode lags behind reality.
+        #   (We already handle game_over_now above, but this is a safe belt-and-suspenders.)
+        latest_state = fresh_game_state()
+        latest_game_over = bool(latest_state.get("game_over", False))
+        context = "rematch" if (rematch_mode or latest_game_over) else "gameplay"
+
+        # Gameplay replies are streamed: each clause is said as soon as it arrives.
+        spoken = []
+
+        def speak_clause(clause):
+            spoken.append(clause)
+            reactor.callFromThread(say_queued, session, clause)
+
+        # Clear yes/no doesn't need the LLM to pick ACTION_RESET/ACTION_QUIT
+        intent = rematch_intent(text) if context == "rematch" else None
+        if intent == "yes":
+            reply = "ACTION_RESET"
+        elif intent == "no":
+            reply = "ACTION_QUIT"
+        else:
+            reply = generate_response(
+                text, context, on_clause=speak_clause if context == "gameplay" else None, state=latest_state
+            ) or ""
+
+        # Behavior tags in the model output map to actual robot motions
+        # (first tag in the reply wins)
+        # (every tag starts with "[", so untagged replies skip both regexes)
+        anim = None
+        speech = reply
+        if "[" in reply:
+            tag = TAG_RE.search(reply)
+            if tag:
+                anim = draw(("TAG", tag.group(1)), TAG_MOVES[tag.group(1)])
+
+            # Clean the actual spoken text by removing tags.
+            speech = TAG_RE.sub("", reply)
+        speech = speech.strip()
+
+        # LLM-based rematch handling still exists as fallback.
+        # In practice, the direct handler above should handle game_over reliably first.
+        if "ACTION_RESET" in reply:
+            print("[Brain] 🟢 Rematch!")
+            reactor.callFromThread(say_queued, session, "Here we go again!")
+            trigger_reset()
+
+            # IMPORTANT CHANGE:
+            # - Same auto-stand behavior after reset for the LLM fallback path.
+            reactor.callFromThread(
+                reactor.callLater,
+                0.6,
+                safe_play_behavior,
+                session,
+                "BlocklyStand",
+                True,
+                "post-reset auto-stand (LLM fallback)"
+            )
+
+            reset_per_game_flags()
+            rematch_mode = False
+
+        elif "ACTION_QUIT" in reply:
+            print("[Brain] 🔴 Quit.")
+            in_reactor(
+                (say_queued, session, "Fine, bye."),
+                (lambda: session.call(PLAY_BEHAVIOR, name="BlocklyCrouch", sync=False),),
+            )
+            last_posture = "crouch"
+
+        else:
+            if speech:
+                print(f"[Brain] 🤖 Robot: {speech}")
+                if not spoken:
+                    reactor.callFromThread(say_queued, session, speech)
+
+            # If an animation was requested and passes our gating, schedule it slightly after speech
+            # so the audio doesn't get cut.
+            if anim and _should_allow_tag_behavior(anim):
+                reactor.callFromThread(reactor.callLater, TAG_BEHAVIOR_DELAY, do_behavior, session, anim)
+
+        # is_speaking drops when the robot has actually finished talking
+        # (the queued SAYs return), not after a fixed guess.
+        reactor.callFromThread(after_queued_speech, _speech_finished)
+
+    except Exception:
+        is_speaking = False
+
+
 def listen_loop(session):
     """
     This loop is the "speech brain".
@@ -1304,12 +2203,23 @@ def listen_loop(session):
        - Blowout interrupts (win/lose by a lot): say a canned phrase + ignore input
     5) If none of the above triggers, use LLM to generate a one-liner response
     6) Optionally trigger a behavior tag (rare)
+
+    Only step 1 (and the audio gate) runs here; steps 2-6 are _handle_utterance,
+    queued on _utterance_worker so the mic never sits idle during STT/LLM.
     """
-    global is_speaking, rematch_mode, last_interaction_time, last_posture
-    global user_name, ending_sequence_active, pending_rematch_action, rematch_prompted
+    use_vad = STT_VAD > 0
+    if use_vad:
+        try:
+            _get_vad()
+        except Exception as e:
+            print(f"[Brain] VAD unavailable, using recognizer.listen: {e}")
+            use_vad = False
 
+    with _microphone() as source:
+        if use_vad and source.SAMPLE_RATE != VAD_RATE:
+            print("[Brain] VAD needs a 16 kHz mic, using recognizer.listen")
+            use_vad = False
 
-    with sr.Microphone() as source:
         print("[Brain] 🎧 Calibrating...")
 
         # ------------------------------------------------------------------
@@ -1323,13 +2233,34 @@ def listen_loop(session):
         recognizer.non_speaking_duration = 0.3
         recognizer.phrase_threshold = 0.25
 
-        recognizer.adjust_for_ambient_noise(source, duration=1)
+        saved = None if MIC_RECALIBRATE else _load_energy_threshold()
+        if saved is not None:
+            recognizer.energy_threshold = saved
+            print(f"[Brain] 🎧 Reusing saved energy threshold {saved:.0f}")
+        else:
+            recognizer.adjust_for_ambient_noise(source, duration=1)
+
+        if STT_PROVIDER == "local" and not USE_OPENAI_STT:
+            # load the model now, not on the user's first sentence
+            try:
+                _get_whisper_model()
+            except Exception as e:
+                print(f"[Brain] STT(local) unavailable, using fallback: {e}")
         print("[Brain] 👂 Listening!")
 
         while not shutdown_event.is_set():
             try:
+                # Rematch answers are one short word: end the phrase after
+                # 0.35s of silence instead of 0.6s, and cap it at 2s.
+                # (pause_threshold must stay >= non_speaking_duration = 0.3)
+                short = rematch_mode or bool(current_game_state.get("game_over", False))
+                recognizer.pause_threshold = 0.35 if short else 0.6
+                recognizer.phrase_threshold = 0.15 if short else 0.25
                 try:
-                    audio = recognizer.listen(source, timeout=1, phrase_time_limit=5)
+                    if use_vad:
+                        audio = _listen_vad(source, timeout=1, phrase_time_limit=2 if short else 5)
+                    else:
+                        audio = recognizer.listen(source, timeout=1, phrase_time_limit=2 if short else 5)
                     # ------------------------------------------------------------------
                     # AUDIO GATE (MOST IMPORTANT FIX)
                     #
@@ -1342,237 +2273,14 @@ def listen_loop(session):
                 except sr.WaitTimeoutError:
                     continue
 
-                try:
-                    # IMPORTANT CHANGE:
-                    # - STT is now switchable (Google vs OpenAI) using STT_PROVIDER / USE_OPENAI_STT.
-                    # - This is isolated behind transcribe_audio() so the rest of the logic stays identical.
-                    text = transcribe_audio(audio) or ""
-                    if not text:
-                        continue
-
-                    last_interaction_time = time.time()
-                    print(f"[Brain] 🗣️ You: {text}")
-
-                    # Peek game state NOW (fresh backend truth).
-                    # This lets speech logic react correctly even if game_loop hasn't ticked yet.
-                    state = fetch_game_state()
-                    lead_now = int(state.get("ai_lead", 0) or 0)
-                    game_over_now = bool(state.get("game_over", False))
-
-                    # --- NAME LOCK (START-OF-GAME ONLY) ---
-                    # We only accept a name at the beginning of a game.
-                    # This prevents accidental captures like "I'm winning", "I'm tired", etc.
-                    turn_now = int(state.get("turn_index", -1) or -1)
-                    if (user_name is None) and (turn_now <= 0) and (not game_over_now) and (not rematch_mode):
-                        name = maybe_extract_name(text)
-                        if name:
-                            user_name = name
-                            print(f"[Brain] ✅ Locked user_name={user_name}")
-                    #-------------
-                    # POST-STT FILTER (OPTIONAL BUT VERY EFFECTIVE)
-                    #
-                    # If we are NOT in rematch/game_over flow, ignore 1-word transcripts.
-                    # This stops the robot replying to random single tokens (noise -> "I", "Dios", etc.).
-                    # ------------------------------------------------------------------
-                    if _should_ignore_transcript_midgame(text, game_over_now=game_over_now):
-                        if STT_DEBUG_AUDIO:
-                            print(f"[Brain] 🧹 Ignored short transcript midgame: {text!r}")
-                        continue
-
-
-                    # Reset per-game flags when a new game starts:
-                    # Detect transition: game_over True -> False (after /reset)
-                    global _prev_game_over_seen
-                    if _prev_game_over_seen is None:
-                        _prev_game_over_seen = game_over_now
-                    else:
-                        if _prev_game_over_seen and not game_over_now:
-                            reset_per_game_flags()
-                        _prev_game_over_seen = game_over_now
-
-                    # ------------------------------------------------------------------
-                    # HARD REMATCH HANDLER (race-condition fix)
-                    #
-                    # Problem:
-                    # - User says "yes" exactly when the game ends.
-                    # - Backend already says game_over=True.
-                    # - But game_loop hasn't processed it yet -> rematch_mode might still be False.
-                    # - Then we send text to gameplay LLM, and reset never triggers.
-                    #
-                    # Fix:
-                    # - If backend says game_over_now=True, we treat rematch as active RIGHT HERE.
-                    # - We parse YES/NO deterministically using regex and trigger reset immediately.
-                    # - This path avoids the LLM entirely, so it can't "forget" to output ACTION_RESET.
-                    # ------------------------------------------------------------------
-                    if game_over_now:
-
-                        intent = rematch_intent(text)
-
-                        # During cutscene: only record, do NOT reset yet
-                        if ending_sequence_active:
-                            if intent == "yes":
-                                pending_rematch_action = "reset"
-                            elif intent == "no":
-                                pending_rematch_action = "quit"
-                            continue
-
-                        # After prompt (or if prompt flag lags): act immediately
-                        if intent == "yes":
-                            print("[Brain] 🟢 Rematch!")
-                            is_speaking = True
-                            reactor.callFromThread(session.call, "rie.dialogue.say", text="Here we go again!")
-                            trigger_reset()
-                            reset_per_game_flags()
-                            rematch_mode = False
-                            rematch_prompted = False
-                            time.sleep(0.6)
-                            is_speaking = False
-                            continue
-
-                        if intent == "no":
-                            print("[Brain] 🔴 Quit.")
-                            is_speaking = True
-                            reactor.callFromThread(session.call, "rie.dialogue.say", text="Fine, bye.")
-                            time.sleep(0.6)
-                            is_speaking = False
-                            continue
-
-                        if rematch_prompted:
-                            # only nag if we actually prompted
-                            is_speaking = True
-                            reactor.callFromThread(session.call, "rie.dialogue.say", text="Say yes for a rematch, or no to quit.")
-                            time.sleep(0.6)
-                            is_speaking = False
-                        continue
-
-                    # Only do blowout interrupts midgame (not during rematch prompt, not after game_over)
-                    global used_losing_big_interrupt, used_winning_big_interrupt
-
-                    if (not rematch_mode) and (not game_over_now):
-                        if (lead_now <= -BLOWOUT_LEAD) and (not used_losing_big_interrupt):
-                            used_losing_big_interrupt = True
-                            phrase = random.choice(LOSING_BIG_INTERRUPTS)
-
-                            if is_speaking:
-                                reactor.callFromThread(session.call, "rie.dialogue.stop")
-
-                            print(f"[Brain] 🤖 BlowoutInterrupt(LOSING): {phrase}")
-                            is_speaking = True
-                            reactor.callFromThread(session.call, "rie.dialogue.say", text=phrase)
-                            time.sleep(1.0)
-                            is_speaking = False
-                            continue  # IMPORTANT: ignore user's message, no LLM response
-
-                        if (lead_now >= BLOWOUT_LEAD) and (not used_winning_big_interrupt):
-                            used_winning_big_interrupt = True
-                            phrase = random.choice(WINNING_BIG_INTERRUPTS)
-
-                            if is_speaking:
-                                reactor.callFromThread(session.call, "rie.dialogue.stop")
-
-                            print(f"[Brain] 🤖 BlowoutInterrupt(WINNING): {phrase}")
-                            is_speaking = True
-                            reactor.callFromThread(session.call, "rie.dialogue.say", text=phrase)
-                            time.sleep(1.0)
-                            is_speaking = False
-                            continue  # IMPORTANT: ignore user's message, no LLM response
-
-                except Exception:
-                    continue
-
-                # Learn user name (only once). This is used for personalization.
-                # IMPORTANT CHANGE:
-                # - Previously you only learned the name once (user_name is None).
-                # - If STT misheard the name the first time, you were stuck forever.
-                # - Now: if user says "my name is X" again, we update it.
-                name = maybe_extract_name(text)
-                if name and name != user_name:
-                    user_name = name
-                    print(f"[Brain] ✅ Updated user_name={user_name}")
-
-                # If robot is speaking, stop current speech so responses feel reactive.
-                if is_speaking:
-                    reactor.callFromThread(session.call, "rie.dialogue.stop")
-
-                is_speaking = True
-
-                # PATCH 3 (extra safety):
-                # - Decide context based on rematch_mode *AND* fresh backend truth.
-                # - This prevents misrouting even if rematch_mode lags behind reality.
-                #   (We already handle game_over_now above, but this is a safe belt-and-suspenders.)
-                latest_state = fetch_game_state()
-                latest_game_over = bool(latest_state.get("game_over", False))
-                context = "rematch" if (rematch_mode or latest_game_over) else "gameplay"
-
-                reply = generate_response(text, context) or ""
-
-                # Behavior tags in the model output map to actual robot motions
-                anim = None
-                if "[DANCE]" in reply:
-                    anim = random.choice(MOVES["WIN_BIG"])
-                elif "[DAB]" in reply:
-                    anim = "BlocklyDab"
-                elif "[SNEEZE]" in reply:
-                    anim = "BlocklySneeze"
-                elif "[CLAP]" in reply:
-                    anim = "BlocklyApplause"
-                elif "[SAD]" in reply:
-                    anim = random.choice(MOVES["LOSE"])
-
-                # Clean the actual spoken text by removing tags.
-                speech = (
-                    reply.replace("[DANCE]", "")
-                    .replace("[DAB]", "")
-                    .replace("[SNEEZE]", "")
-                    .replace("[CLAP]", "")
-                    .replace("[SAD]", "")
-                    .strip()
-                )
-
-                # LLM-based rematch handling still exists as fallback.
-                # In practice, the direct handler above should handle game_over reliably first.
-                if "ACTION_RESET" in reply:
-                    print("[Brain] 🟢 Rematch!")
-                    reactor.callFromThread(session.call, "rie.dialogue.say", text="Here we go again!")
-                    trigger_reset()
-
-                    # IMPORTANT CHANGE:
-                    # - Same auto-stand behavior after reset for the LLM fallback path.
-                    reactor.callFromThread(
-                        reactor.callLater,
-                        0.6,
-                        safe_play_behavior,
-                        session,
-                        "BlocklyStand",
-                        True,
-                        "post-reset auto-stand (LLM fallback)"
-                    )
-
-                    reset_per_game_flags()
-                    rematch_mode = False
-
-                elif "ACTION_QUIT" in reply:
-                    print("[Brain] 🔴 Quit.")
-                    reactor.callFromThread(session.call, "rie.dialogue.say", text="Fine, bye.")
-                    reactor.callFromThread(session.call, "rom.optional.behavior.play", name="BlocklyCrouch", sync=False)
-                    last_posture = "crouch"
-
-                else:
-                    if speech:
-                        print(f"[Brain] 🤖 Robot: {speech}")
-                        reactor.callFromThread(session.call, "rie.dialogue.say", text=speech)
-
-                    # If an animation was requested and passes our gating, schedule it slightly after speech
-                    # so the audio doesn't get cut.
-                    if anim and _should_allow_tag_behavior(anim):
-                        reactor.callFromThread(reactor.callLater, TAG_BEHAVIOR_DELAY, do_behavior, session, anim)
-
-                time.sleep(1.0)
-                is_speaking = False
+                # STT + reply run on the utterance worker, so the mic is already
+                # listening for the next phrase while this one is transcribed.
+                _utterance_worker.submit(_handle_utterance, session, audio)
 
             except Exception:
-                is_speaking = False
+                pass
 
+    _save_energy_threshold(recognizer.energy_threshold)
     print("[Brain] listen_loop exited.")
 
 
@@ -1580,7 +2288,8 @@ def do_behavior(session, name):
     # Runs in reactor thread (scheduled by reactor.callLater)
     # IMPORTANT CHANGE:
     # - Use safe_play_behavior for better logs + posture tracking.
-    print(f"[Brain] 🕺 Triggered: {name}")
+    if BRAIN_DEBUG:
+        print(f"[Brain] 🕺 Triggered: {name}")
     safe_play_behavior(session, name, sync=True, why="LLM-tagged behavior")
 
 # --- WAMP SETUP ---
@@ -1603,6 +2312,8 @@ def main(session, details):
     # - Use safe_play_behavior so failures are visible and posture tracking stays correct.
     yield safe_play_behavior(session, "BlocklyStand", sync=True, why="startup baseline")
 
+    reactor.callInThread(warmup_openai)
+    reactor.callInThread(precache_canned_tts)
     if USE_LOCAL_MIC:
         reactor.callInThread(listen_loop, session)
 
@@ -1617,7 +2328,7 @@ def _on_disconnect(session, was_clean):
     request_shutdown("wamp disconnect")
 
 wamp = Component(
-    transports=[{"url": WAMP_URL, "serializers": ["msgpack"], "max_retries": 999999}],
+    transports=[{"url": WAMP_URL, "serializers": WAMP_SERIALIZERS, "max_retries": 999999}],
     realm=ROBOT_REALM,
 )
 wamp.on_join(main)